@@ -1,132 +1,249 @@
-from .utilities import get_board_string
-from typing import Dict, List, TYPE_CHECKING
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .types import (
-        BoardType,
-        MoveHisType,
-        MaterialType,
-        PlayerType,
-        MoveType,
         TreeNodeType,
         GameStateType,
-        GameStatusType
+        GameStatusType,
+        PositionType,
+        PositionMoveType,
+        ColourType
     )
 
 import math
+from timeit import default_timer as timer
 from .game_logic import Logic
-from .copy_game_objects import CopyGameObjects
-from .constants import PIECE_TYPES
-from .move import Move
-PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
+from .position import OTHER_COLOUR, COLOURS
+from .piece_square_tables import tapered_score
+from .transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from .move_ordering import MoveOrdering
+from .move_encoding import NULL_MOVE
+from . import settings
 
 
+# Every node of the tree shares the game's Position. The search makes a node's move before
+# expanding or searching the node and unmakes it afterwards, so the position is only at this
+# state while the node is being visited - everything else a node needs is computed up front,
+# apart from legal_moves in one-sided search which are only generated if the node is expanded.
 class GameState:
+    __slots__ = (
+        'position', 'colour', 'game_status', '_legal_moves', 'mobility', 'material', 'piece_square_score', 'phase'
+    )
+
     def __init__(
         self,
-        board: 'BoardType',
-        move_history: 'MoveHisType',
-        material: 'MaterialType',
-        player: 'PlayerType',
-        opponent: 'PlayerType',
-        game_status: 'GameStatusType'
+        position: 'PositionType',
+        game_status: 'GameStatusType',
+        legal_moves: 'List[PositionMoveType] | None',
+        mobility: 'Dict[ColourType, int] | None'
     ) -> None:
-        self.board = board
-        self.move_history = move_history
-        self.material = material
-        self.player = player
-        self.opponent = opponent
+        self.position = position
+        self.colour: 'ColourType' = position.side_to_move
         self.game_status = game_status
-        self.move_history_str = str(move_history)
-        
+        self._legal_moves = legal_moves
+        # each side's number of legal moves, or Position.mobility estimates in one-sided search.
+        # None if the evaluator doesn't use it
+        self.mobility = mobility
+        self.material = position.material['white'] - position.material['black']
+        self.piece_square_score = position.piece_square_score
+        self.phase = position.phase
+
+    # only valid while the position is at this state
+    @property
+    def legal_moves(self) -> 'List[PositionMoveType]':
+        if self._legal_moves is None:
+            self._legal_moves = self.position.legal_moves()
+        return self._legal_moves
 
 
 class TreeNode:
+    __slots__ = (
+        'move_before_current_state',
+        'game_state_after_move',
+        'children',
+        'best_move',
+        'best_move_node',
+        'eval',
+        'principal_variation'
+    )
+
     def __init__(
         self: 'TreeNodeType',
-        game_state_after_move: 'GameStateType'
+        game_state_after_move: 'GameStateType',
+        move_before_current_state: 'PositionMoveType | None' = None
     ) -> None:
-        move_history = game_state_after_move.move_history
-        self.move_before_current_state = move_history[-1] if len(move_history) > 0 else None
+        self.move_before_current_state = move_before_current_state
         self.game_state_after_move = game_state_after_move
-        self.children: 'Dict[str, TreeNodeType]' = {}
-        self.best_move: 'None | MoveType ' = None
+        self.children: 'Dict[PositionMoveType, TreeNodeType]' = {}
+        self.best_move: 'None | PositionMoveType' = None
         self.best_move_node: 'None | TreeNodeType' = None
         self.eval: 'None | float' = None
+        # the moves the search expects from here, best_move first. Only set on the root and its
+        # children
+        self.principal_variation: 'List[PositionMoveType]' = []
+
+
+# raised inside the search when it runs out of time or nodes, see ChessAI.iterative_deepening
+class SearchAborted(Exception):
+    pass
+
+
+# how much (in pawns) a position's evaluation can change on top of the material a capture wins,
+# for delta pruning in ChessAI.quiescence
+DELTA_MARGIN = 2
+
+# Selective search in ChessAI.negamax, each turned on by its own setting:
+# - null-move pruning: when the evaluation is at least beta, searches passing the turn
+#   NULL_MOVE_REDUCTION + 1 plies shallower, with a null window at beta. If the opponent still can't
+#   get the score below beta the node fails high without searching any moves. Not done in check
+#   (passing would be illegal) or with only pawns left (where passing can be the best move, so it
+#   isn't a lower bound)
+# - late move reductions: quiet moves tried after the first LATE_MOVE_REDUCTION_MOVES (so after the
+#   hash move, captures and killers, usually) are searched a ply shallower with a null window at
+#   alpha, and only searched again at full depth if they beat alpha
+# - futility pruning: one ply from the leaves, quiet moves that don't give check are skipped when
+#   the evaluation plus FUTILITY_MARGIN is still at most alpha
+# - razoring: two plies from the leaves, when the evaluation plus RAZORING_MARGIN is at most alpha
+#   the node goes straight to quiescence search, and fails low if that doesn't beat alpha
+# Margins are in pawns, like the evaluation
+NULL_MOVE_REDUCTION = 2
+LATE_MOVE_REDUCTION_MOVES = 3
+FUTILITY_MARGIN = 2
+RAZORING_MARGIN = 4
+
+# With settings.aspiration_windows, iterative_deepening searches each depth after the first with a
+# window ASPIRATION_WINDOW pawns either side of the last depth's score. When the score falls
+# outside it the window is made 4 times as wide on that side and the depth searched again, and
+# once it would be wider than ASPIRATION_MAX_WINDOW that side is left open
+ASPIRATION_WINDOW = 0.25
+ASPIRATION_MAX_WINDOW = 8
 
 
 class ChessAI:
+    # number of nodes visited by the last search
+    nodes_searched = 0
+    # the search raises SearchAborted once the timer passes deadline or nodes_searched reaches
+    # node_limit. Both are only set during iterative_deepening
+    deadline: 'float | None' = None
+    node_limit: 'int | None' = None
+    # depth of the last iteration iterative_deepening finished
+    completed_depth = 0
+    # killer moves and history, kept between searches (see MoveOrdering.age)
+    move_ordering = MoveOrdering()
+    # beta cutoffs in the last search, and how many of them were from the first move tried
+    cutoffs = 0
+    first_move_cutoffs = 0
+    # how many of the last search's nodes were in quiescence search
+    quiescence_nodes = 0
+    # kept between searches (see get_transposition_table), None if it's turned off
+    transposition_table: 'TranspositionTable | None' = None
+    # the settings the transposition table's scores were searched with
+    transposition_table_settings: 'Tuple | None' = None
+
     @staticmethod
-    def get_child_game_state(
-        move_to_make: 'MoveType',
-        player: 'PlayerType',
-        opponent: 'PlayerType',
-        material: 'MaterialType',
-        move_history: 'MoveHisType'
-    ):
-        move = move_to_make
-        from_loc = move.from_loc
-        to_loc = move.to_loc
-
-        temp_player = CopyGameObjects.copy_player(player)
-        temp_opponent = CopyGameObjects.copy_player(opponent)
-        temp_board = Logic.get_board_from_pieces(temp_player.pieces, temp_opponent.pieces)
-        temp_board_str = get_board_string(temp_board)
-        temp_material = CopyGameObjects.copy_material(material)
-        temp_move_history = CopyGameObjects.copy_move_history(move_history)
-
-        game_status = Logic.make_move(
-            temp_board,
-            temp_player,
-            temp_opponent,
-            temp_move_history,
-            temp_material,
-            Move(from_loc, to_loc, temp_board, temp_board_str, move.special_move),
-            temp_board_str
-        )
-        child_game_state = GameState(
-            temp_board,
-            temp_move_history,
-            temp_material,
-            temp_opponent,
-            temp_player,
-            game_status
-        )
-        return child_game_state
-    
+    def get_game_state(position: 'PositionType', game_status: 'GameStatusType | None' = None) -> 'GameStateType':
+        if settings.one_sided_search:
+            return ChessAI.get_one_sided_game_state(position, game_status)
+
+        colour = position.side_to_move
+        legal_moves = position.legal_moves()
+        num_legal_moves = None
+        if settings.evaluator == 'material' and settings.mobility == 'attacks':
+            num_legal_moves = {side: position.mobility(side) for side in COLOURS}
+        elif settings.evaluator == 'material':
+            num_legal_moves = {
+                colour: len(legal_moves),
+                OTHER_COLOUR[colour]: len(position.legal_moves(OTHER_COLOUR[colour]))
+            }
+        if game_status is None:
+            game_status = Logic.get_position_status(position, len(legal_moves))
+        return GameState(position, game_status, legal_moves, num_legal_moves)
+
+    # doesn't generate any legal moves: the status only needs to know if the side to move has one,
+    # and the mobility of both sides is estimated from their attack sets
+    @staticmethod
+    def get_one_sided_game_state(
+        position: 'PositionType',
+        game_status: 'GameStatusType | None' = None
+    ) -> 'GameStateType':
+        if game_status is None:
+            game_status = Logic.get_position_status(position, 1 if position.has_legal_move() else 0)
+        mobility = None
+        if settings.evaluator == 'material':
+            mobility = {colour: position.mobility(colour) for colour in COLOURS}
+        return GameState(position, game_status, None, mobility)
+
+    # leaves move_to_make made on the position, the caller has to unmake it
+    @staticmethod
+    def get_child_game_state(move_to_make: 'PositionMoveType', position: 'PositionType') -> 'GameStateType':
+        position.make_move(move_to_make)
+        return ChessAI.get_game_state(position)
+
     @staticmethod
     def add_child_nodes(currentTree: 'TreeNodeType'):
-        player, opponent, material, move_history = (
-            currentTree.game_state_after_move.player,
-            currentTree.game_state_after_move.opponent,
-            currentTree.game_state_after_move.material,
-            currentTree.game_state_after_move.move_history
-        )
+        game_state = currentTree.game_state_after_move
+        position = game_state.position
         child_tree_nodes: 'List[TreeNode]' = []
-        for piece_type in player.pieces:
-            for piece in player.pieces[piece_type]:
-                for move in piece.legal_moves:
-                    child_game_state = ChessAI.get_child_game_state(
-                        move,
-                        player,
-                        opponent,
-                        material,
-                        move_history
-                    )
-                    child_tree_node = TreeNode(child_game_state)
-                    child_tree_node.eval = ChessAI.evaluate_position(child_game_state)
-                    child_tree_nodes.append(child_tree_node)
-        child_tree_nodes.sort(key=lambda state: state.eval, reverse=player.colour == 'white')
-        currentTree.children = {child_node.move_before_current_state.id: child_node for child_node in child_tree_nodes}
+        for move in game_state.legal_moves:
+            child_game_state = ChessAI.get_child_game_state(move, position)
+            child_tree_node = TreeNode(child_game_state, move)
+            child_tree_node.eval = ChessAI.evaluate_position(child_game_state)
+            position.unmake_move()
+            child_tree_nodes.append(child_tree_node)
+        child_tree_nodes.sort(key=lambda state: state.eval, reverse=game_state.colour == 'white')
+        currentTree.children = {child_node.move_before_current_state: child_node for child_node in child_tree_nodes}
 
+    # The node's moves in the order the search tries them, with the child node if there is one yet.
+    # They come from Position.staged_legal_moves with the node's best move from an earlier search
+    # first, so once the search stops, later moves are never generated or made. sort_by_eval
+    # orders them like add_child_nodes instead (outside one-sided search), which is only needed
+    # where the order decides between equally good moves, i.e. at the root. ChessAI.negamax
+    # orders its moves itself, since it may not have a node
     @staticmethod
-    def evaluate_position(game_state: 'GameStateType') -> float:
-        player, opponent, material, game_status = (
-            game_state.player,
-            game_state.opponent,
-            game_state.material,
-            game_state.game_status
+    def get_child_nodes(
+        currentTree: 'TreeNodeType',
+        sort_by_eval: bool = False
+    ) -> 'Iterator[Tuple[PositionMoveType, TreeNodeType | None]]':
+        if sort_by_eval and not settings.one_sided_search:
+            if len(currentTree.children) == 0:
+                ChessAI.add_child_nodes(currentTree)
+            yield from currentTree.children.items()
+            return
+
+        position = currentTree.game_state_after_move.position
+        move_ordering = ChessAI.move_ordering if settings.ordering_heuristics else None
+        for move in position.staged_legal_moves(currentTree.best_move, move_ordering):
+            yield move, currentTree.children.get(move)
+
+    # The table is only replaced when its size or the evaluation settings change, since scores
+    # searched with another evaluator would be wrong
+    @staticmethod
+    def get_transposition_table() -> 'TranspositionTable | None':
+        table_settings = (
+            settings.transposition_table_mb,
+            settings.evaluator,
+            settings.mobility,
+            settings.one_sided_search,
+            settings.quiescence,
+            settings.quiescence_max_ply
         )
+        if table_settings != ChessAI.transposition_table_settings:
+            ChessAI.transposition_table_settings = table_settings
+            ChessAI.transposition_table = None
+            if settings.transposition_table_mb > 0:
+                ChessAI.transposition_table = TranspositionTable(settings.transposition_table_mb)
+        return ChessAI.transposition_table
+
+    # forget everything learnt in earlier searches, e.g. for a new game or to measure searches independently
+    @staticmethod
+    def clear_search_memory() -> None:
+        if ChessAI.transposition_table is not None:
+            ChessAI.transposition_table.clear()
+        ChessAI.move_ordering.clear()
+
+    @staticmethod
+    def evaluate_position(game_state: 'GameStateType') -> float:
+        game_status = game_state.game_status
 
         if game_status.winner is not None:
             return (-1) ** (game_status.winner == 'black') * math.inf
@@ -134,59 +251,430 @@ class ChessAI:
         if game_status.game_result == 'draw':
             return 0
 
-        num_legal_moves = [player.num_legal_moves, opponent.num_legal_moves]
-        mat = [0, 0]
-        for i, p in enumerate((player, opponent)):
-            mat[i] += (
-                material[p.colour][PAWNS]
-                + material[p.colour][KNIGHTS] * 3
-                + material[p.colour][BISHOPS] * 3
-                + material[p.colour][ROOKS] * 5
-                + material[p.colour][QUEENS] * 9
-            )
+        # in pawns, like the material evaluation
+        if settings.evaluator == 'piece_square':
+            return tapered_score(game_state.piece_square_score, game_state.phase) / 100
 
-        white_player = 1 - int(player.colour == 'white')
-        black_player = 1 - white_player
-        return mat[white_player] - mat[black_player] + (num_legal_moves[white_player] - num_legal_moves[black_player]) / 50
+        mobility = game_state.mobility
+        assert mobility is not None
+        return game_state.material + (mobility['white'] - mobility['black']) / 50
 
+    # Alpha-beta search, best_move/eval end up on currentTree like minimax would leave them:
+    # best_move is the last of the root's children (in get_child_nodes order) with the best
+    # score. To keep that tie-break each child after the first is searched with alpha just below
+    # the best score so far, so a child that ties gets an exact score instead of a bound.
+    # alpha and beta are the root's window (from the side to move's point of view), see
+    # iterative_deepening. If the best score is outside it, it's only a bound on the real score.
+    # With settings.tree_free_search only the root's children are kept as nodes, with their best
+    # move and principal variation, and nothing below them is
     @staticmethod
     def calculate_deep_moves(
-        currentTree: 'TreeNode',
+        currentTree: 'TreeNodeType',
         depth: int,
         alpha: float = -math.inf,
-        beta: float = math.inf,
-    ):
-        player = currentTree.game_state_after_move.player
+        beta: float = math.inf
+    ) -> 'TreeNodeType':
+        ChessAI.nodes_searched = 1
+        ChessAI.cutoffs = ChessAI.first_move_cutoffs = ChessAI.quiescence_nodes = 0
+        transposition_table = ChessAI.get_transposition_table()
+        if transposition_table is not None:
+            transposition_table.reset_stats()
+        ChessAI.move_ordering.age()
+        game_state = currentTree.game_state_after_move
+        position = game_state.position
+        sign = 1 if game_state.colour == 'white' else -1
 
         if depth == 0:
-            currentTree.eval = ChessAI.evaluate_position(currentTree.game_state_after_move)
+            currentTree.eval = ChessAI.evaluate_position(game_state)
             return currentTree
 
-        curr_eval = (-1) ** (player.colour == 'white') * math.inf
+        best_score = -math.inf
+        currentTree.best_move = None
+        currentTree.principal_variation = []
+        for move, child_node in ChessAI.get_child_nodes(currentTree, sort_by_eval=True):
+            child_alpha = alpha
+            if currentTree.best_move is not None:
+                child_alpha = max(alpha, math.nextafter(best_score, -math.inf))
+            position.make_move(move)
+            if child_node is None:
+                child_node = TreeNode(ChessAI.get_game_state(position), move)
+                currentTree.children[move] = child_node
+            child_variation: 'List[PositionMoveType]' = []
+            score = -ChessAI.negamax(
+                child_node.game_state_after_move, depth - 1, -beta, -child_alpha, 1, child_variation,
+                None if settings.tree_free_search else child_node
+            )
+            position.unmake_move()
+            child_node.principal_variation = child_variation
+            if settings.tree_free_search:
+                child_node.best_move = child_variation[0] if child_variation else None
+
+            if score >= best_score:
+                best_score = score
+                currentTree.best_move = move
+                currentTree.best_move_node = child_node
+                currentTree.principal_variation = [move, *child_variation]
+                if best_score >= beta:
+                    break
 
-        if len(currentTree.children) == 0:
-            ChessAI.add_child_nodes(currentTree)
+        currentTree.eval = sign * best_score
+        if transposition_table is not None:
+            if best_score <= alpha:
+                bound = UPPER_BOUND
+            elif best_score >= beta:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            transposition_table.store(position.hash, depth, bound, best_score, currentTree.best_move)
+        return currentTree
 
-        max_or_min = max if player.colour == 'white' else min
+    # Searches depth 1, 2, 3, ... until movetime_ms, max_nodes (both across all the iterations) or
+    # max_depth runs out, and leaves the result of the last iteration that finished on currentTree.
+    # An iteration that runs out part of the way through is thrown away, so it doesn't matter
+    # how far it got. Depth 1 is always finished so there's a move to play
+    @staticmethod
+    def iterative_deepening(
+        currentTree: 'TreeNodeType',
+        movetime_ms: 'int | None' = None,
+        max_depth: 'int | None' = None,
+        max_nodes: 'int | None' = None
+    ) -> 'TreeNodeType':
+        if movetime_ms is None and max_depth is None and max_nodes is None:
+            raise ValueError('iterative_deepening needs a time, depth or node limit')
+        position = currentTree.game_state_after_move.position
+        undo_stack_size = len(position.undo_stack)
+        start = timer()
+        total_nodes = 0
+        completed = (
+            currentTree.best_move, currentTree.best_move_node, currentTree.eval, currentTree.principal_variation
+        )
+        ChessAI.completed_depth = 0
 
-        for child_node in currentTree.children.values():
-            move = child_node.move_before_current_state
-            if depth > 0 and beta > alpha:
-                child_node = ChessAI.calculate_deep_moves(
-                    child_node,
-                    depth - 1,
-                    alpha,
-                    beta
+        sign = 1 if currentTree.game_state_after_move.colour == 'white' else -1
+        depth = 1
+        while max_depth is None or depth <= max_depth:
+            alpha, beta = -math.inf, math.inf
+            if settings.aspiration_windows and depth > 1 and not math.isinf(currentTree.eval):
+                window = ASPIRATION_WINDOW
+                previous_score = sign * currentTree.eval
+                alpha, beta = previous_score - window, previous_score + window
+            try:
+                while True:
+                    if depth > 1:
+                        if movetime_ms is not None:
+                            ChessAI.deadline = start + movetime_ms / 1000
+                        if max_nodes is not None:
+                            ChessAI.node_limit = max_nodes - total_nodes
+                    ChessAI.calculate_deep_moves(currentTree, depth, alpha, beta)
+                    total_nodes += ChessAI.nodes_searched
+                    score = sign * currentTree.eval
+                    if score <= alpha and alpha > -math.inf:
+                        window *= 4
+                        alpha = previous_score - window if window <= ASPIRATION_MAX_WINDOW else -math.inf
+                    elif score >= beta and beta < math.inf:
+                        window *= 4
+                        beta = previous_score + window if window <= ASPIRATION_MAX_WINDOW else math.inf
+                    else:
+                        break
+            except SearchAborted:
+                # unwind the moves the search had made
+                while len(position.undo_stack) > undo_stack_size:
+                    position.unmake_any_move()
+                (
+                    currentTree.best_move, currentTree.best_move_node, currentTree.eval,
+                    currentTree.principal_variation
+                ) = completed
+                total_nodes += ChessAI.nodes_searched
+                break
+            finally:
+                ChessAI.deadline = None
+                ChessAI.node_limit = None
+
+            completed = (
+                currentTree.best_move, currentTree.best_move_node, currentTree.eval, currentTree.principal_variation
+            )
+            ChessAI.completed_depth = depth
+            # nothing to search, or a forced mate has been found
+            if currentTree.best_move is None or math.isinf(currentTree.eval):
+                break
+            if movetime_ms is not None and timer() - start >= movetime_ms / 1000:
+                break
+            if max_nodes is not None and total_nodes >= max_nodes:
+                break
+            depth += 1
+
+        ChessAI.nodes_searched = total_nodes
+        return currentTree
+
+    # Fail-soft alpha-beta in negamax form: scores are from the point of view of the side to
+    # move, and the result can be outside (alpha, beta), in which case it's a bound on the
+    # real score. principal_variation is filled with the best line found from game_state (empty
+    # when the node is answered without trying a move). node is game_state's tree node, whose
+    # children, best move and eval (from white's point of view, like evaluate_position) are kept
+    # for the next search. Without one (settings.tree_free_search) nothing is kept: each child's
+    # GameState is only built while the child is searched and the position is the only state
+    # shared between nodes.
+    # A transposition table entry for the position, searched at least as deep, can answer the
+    # node without searching it, and otherwise its best move is tried first. With
+    # settings.principal_variation_search, the moves after the first are searched with a null
+    # window at alpha, and only searched again with the full window if they beat alpha.
+    # Null-move pruning, late move reductions, futility pruning and razoring are described above
+    # NULL_MOVE_REDUCTION
+    @staticmethod
+    def negamax(
+        game_state: 'GameStateType',
+        depth: int,
+        alpha: float,
+        beta: float,
+        ply: int,
+        principal_variation: 'List[PositionMoveType]',
+        node: 'TreeNodeType | None' = None
+    ) -> float:
+        ChessAI.count_node()
+        principal_variation.clear()
+        position = game_state.position
+        sign = 1 if game_state.colour == 'white' else -1
+
+        if depth == 0:
+            if settings.quiescence:
+                score = ChessAI.quiescence(game_state, alpha, beta, 0)
+            else:
+                score = sign * ChessAI.evaluate_position(game_state)
+            return ChessAI.node_score(node, sign, score)
+
+        transposition_table = ChessAI.transposition_table
+        hash_move = node.best_move if node is not None else None
+        if transposition_table is not None:
+            entry = transposition_table.probe(position.hash)
+            if entry is not None:
+                _, entry_depth, bound, score, entry_move = entry
+                if entry_depth >= depth and (
+                    bound == EXACT
+                    or bound == LOWER_BOUND and score >= beta
+                    or bound == UPPER_BOUND and score <= alpha
+                ):
+                    return ChessAI.node_score(node, sign, score)
+                if entry_move is not None:
+                    hash_move = entry_move
+
+        in_check = game_state.game_status.is_player_in_check(game_state.colour)
+        null_move = (
+            settings.null_move_pruning
+            and depth > NULL_MOVE_REDUCTION
+            and not in_check
+            and beta < math.inf
+            and not (position.undo_stack and position.undo_stack[-1][0] == NULL_MOVE)
+            and position.has_non_pawn_material(game_state.colour)
+        )
+        static_eval = None
+        if not in_check and (
+            null_move or settings.futility_pruning and depth == 1 or settings.razoring and depth == 2
+        ):
+            static_eval = sign * ChessAI.evaluate_position(game_state)
+
+        # only worth trying when the side to move is doing well enough already
+        if null_move and static_eval >= beta:
+            position.make_null_move()
+            score = -ChessAI.negamax(
+                ChessAI.get_game_state(position), depth - 1 - NULL_MOVE_REDUCTION,
+                -beta, -math.nextafter(beta, -math.inf), ply + 1, []
+            )
+            position.unmake_null_move()
+            if score >= beta:
+                # a mate found after passing isn't a real one
+                return ChessAI.node_score(node, sign, beta if math.isinf(score) else score)
+        if (
+            settings.razoring and depth == 2 and static_eval is not None
+            and static_eval + RAZORING_MARGIN <= alpha
+        ):
+            if settings.quiescence:
+                score = ChessAI.quiescence(game_state, alpha, math.nextafter(alpha, math.inf), 0)
+            else:
+                score = static_eval
+            if score <= alpha:
+                return ChessAI.node_score(node, sign, score)
+        futile = (
+            settings.futility_pruning and depth == 1 and static_eval is not None
+            and static_eval + FUTILITY_MARGIN <= alpha
+        )
+
+        # no legal moves scores -inf, even for stalemate, as the minimax search always did
+        original_alpha = alpha
+        best_score = -math.inf
+        best_move = None
+        moves_tried = 0
+        move_ordering = ChessAI.move_ordering if settings.ordering_heuristics else None
+        child_variation: 'List[PositionMoveType]' = []
+        for move in position.staged_legal_moves(hash_move, move_ordering, ply):
+            moves_tried += 1
+            reduce = (
+                settings.late_move_reductions
+                and depth >= 2
+                and moves_tried > LATE_MOVE_REDUCTION_MOVES
+                and not in_check
+            )
+            quiet = (futile or reduce) and position.is_quiet(move)
+            position.make_move(move)
+            gives_check = quiet and position.in_check(position.side_to_move)
+            if futile and quiet and not gives_check:
+                position.unmake_move()
+                # the move can't do better than this
+                best_score = max(best_score, static_eval + FUTILITY_MARGIN)
+                continue
+            child_node = None
+            if node is None:
+                child_state = ChessAI.get_game_state(position)
+            else:
+                child_node = node.children.get(move)
+                if child_node is None:
+                    child_node = TreeNode(ChessAI.get_game_state(position), move)
+                    node.children[move] = child_node
+                child_state = child_node.game_state_after_move
+            reduced = reduce and quiet and not gives_check
+            if best_move is None or not (reduced or settings.principal_variation_search and alpha > -math.inf):
+                score = -ChessAI.negamax(child_state, depth - 1, -beta, -alpha, ply + 1, child_variation, child_node)
+            else:
+                # after the first move, a null window at alpha is enough to show a move is no better
+                null_window_beta = math.nextafter(alpha, math.inf)
+                score = -ChessAI.negamax(
+                    child_state, depth - 2 if reduced else depth - 1, -null_window_beta, -alpha, ply + 1,
+                    child_variation, child_node
                 )
-                eval = child_node.eval
+                if score > alpha and reduced and settings.principal_variation_search:
+                    score = -ChessAI.negamax(
+                        child_state, depth - 1, -null_window_beta, -alpha, ply + 1, child_variation, child_node
+                    )
+                    reduced = False
+                # a reduced search beating alpha, or a full depth one landing inside the window,
+                # needs the real score
+                if score > alpha and (reduced or score < beta):
+                    score = -ChessAI.negamax(
+                        child_state, depth - 1, -beta, -alpha, ply + 1, child_variation, child_node
+                    )
+            position.unmake_move()
+
+            if score > best_score or best_move is None:
+                best_score = max(best_score, score)
+                best_move = move
+                principal_variation[:] = [move, *child_variation]
+                if node is not None:
+                    node.best_move = move
+                    node.best_move_node = child_node
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        ChessAI.cutoffs += 1
+                        ChessAI.first_move_cutoffs += moves_tried == 1
+                        if settings.ordering_heuristics and position.is_quiet(move):
+                            ChessAI.move_ordering.update(game_state.colour, move, depth, ply)
+                        break
+
+        if transposition_table is not None:
+            if best_score <= original_alpha:
+                bound = UPPER_BOUND
+            elif best_score >= beta:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            transposition_table.store(position.hash, depth, bound, best_score, best_move)
+        return ChessAI.node_score(node, sign, best_score)
+
+    # leaves score (from the side to move's point of view) on node as its eval, if there is a node
+    @staticmethod
+    def node_score(node: 'TreeNodeType | None', sign: int, score: float) -> float:
+        if node is not None:
+            node.eval = sign * score
+        return score
+
+    # Searches captures and promotions from a leaf of the main search, so the leaf isn't evaluated
+    # in the middle of an exchange. Fail-soft negamax like ChessAI.negamax, but without tree nodes.
+    # The side to move can stand pat (take the evaluation as it is) instead of capturing, apart
+    # from in check, where every move is searched. Captures that wouldn't get the score up to
+    # alpha even with DELTA_MARGIN on top of the material they win are skipped (delta pruning),
+    # and count as scoring that much, so a result below alpha is still an upper bound.
+    # After settings.quiescence_max_ply moves the evaluation is returned as it is
+    @staticmethod
+    def quiescence(game_state: 'GameStateType', alpha: float, beta: float, ply: int) -> float:
+        if ply > 0:
+            ChessAI.count_node()
+            ChessAI.quiescence_nodes += 1
+        position = game_state.position
+        sign = 1 if game_state.colour == 'white' else -1
+        stand_pat = sign * ChessAI.evaluate_position(game_state)
+        if game_state.game_status.game_finished or ply >= settings.quiescence_max_ply:
+            return stand_pat
+
+        in_check = position.in_check(game_state.colour)
+        if in_check:
+            best_score = -math.inf
+            moves = position.generate_legal_moves()
+        else:
+            if stand_pat >= beta:
+                return stand_pat
+            best_score = stand_pat
+            alpha = max(alpha, stand_pat)
+            moves = position.generate_legal_moves(quiets=False)
+        moves.sort(key=position.mvv_lva_score, reverse=True)
+
+        for move in moves:
+            if not in_check:
+                # the most the capture could score, like in futility pruning (see ChessAI.negamax)
+                optimistic_score = stand_pat + position.material_gain(move) + DELTA_MARGIN
+                if optimistic_score < alpha:
+                    best_score = max(best_score, optimistic_score)
+                    continue
+            score = -ChessAI.quiescence(ChessAI.get_child_game_state(move, position), -beta, -alpha, ply + 1)
+            position.unmake_move()
+
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    # raises SearchAborted if the search is out of time or nodes
+    @staticmethod
+    def count_node() -> None:
+        ChessAI.nodes_searched += 1
+        if ChessAI.deadline is not None and timer() >= ChessAI.deadline:
+            raise SearchAborted()
+        if ChessAI.node_limit is not None and ChessAI.nodes_searched >= ChessAI.node_limit:
+            raise SearchAborted()
+
+    # Plain minimax over every node, which is what calculate_deep_moves did before it had
+    # working alpha-beta. Only kept to check and measure calculate_deep_moves against
+    @staticmethod
+    def minimax(currentTree: 'TreeNodeType', depth: int) -> 'TreeNodeType':
+        ChessAI.nodes_searched += 1
+        game_state = currentTree.game_state_after_move
+        position = game_state.position
+
+        if depth == 0:
+            if settings.quiescence:
+                sign = 1 if game_state.colour == 'white' else -1
+                currentTree.eval = sign * ChessAI.quiescence(game_state, -math.inf, math.inf, 0)
+            else:
+                currentTree.eval = ChessAI.evaluate_position(game_state)
+            return currentTree
+
+        curr_eval = (-1) ** (game_state.colour == 'white') * math.inf
+        max_or_min = max if game_state.colour == 'white' else min
 
-                curr_eval = max_or_min(curr_eval, eval)
-                if curr_eval == eval:
-                    currentTree.best_move = move
-                    currentTree.best_move_node = child_node
+        for move, child_node in ChessAI.get_child_nodes(currentTree, sort_by_eval=True):
+            position.make_move(move)
+            if child_node is None:
+                child_node = TreeNode(ChessAI.get_game_state(position), move)
+                currentTree.children[move] = child_node
+            child_node = ChessAI.minimax(child_node, depth - 1)
+            position.unmake_move()
+            eval = child_node.eval
 
-                alpha_or_beta = alpha if player.colour == 'white' else beta
-                alpha_or_beta = max_or_min(alpha_or_beta, curr_eval)
+            curr_eval = max_or_min(curr_eval, eval)
+            if curr_eval == eval:
+                currentTree.best_move = move
+                currentTree.best_move_node = child_node
 
         currentTree.eval = curr_eval
-        return currentTree
\ No newline at end of file
+        return currentTree
@@ -0,0 +1,96 @@
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import ColourType
+
+from .bitboards import (
+    FULL_BOARD,
+    ROOK_DIRECTIONS,
+    BISHOP_DIRECTIONS,
+    knight_attacks,
+    king_attacks,
+    pawn_attacks,
+    slide
+)
+
+# Per-square attack tables, built once at import time from the set-wise functions in
+# bitboards.py (a few thousand shifts, so there's nothing to gain from caching them on disk).
+# Squares are indexed as in bitboards.py (square = row * 8 + col).
+KNIGHT_ATTACKS = [knight_attacks(1 << square) for square in range(64)]
+KING_ATTACKS = [king_attacks(1 << square) for square in range(64)]
+PAWN_ATTACKS: 'Dict[ColourType, List[int]]' = {
+    colour: [pawn_attacks(1 << square, colour) for square in range(64)] for colour in ('white', 'black')
+}
+
+
+# every square from square to the edge of the board in one direction (not including square)
+def build_rays(shift: int, mask: int) -> 'List[int]':
+    return [slide(1 << square, FULL_BOARD, shift, mask) for square in range(64)]
+
+
+# squares reached by a slider on an empty board, for each direction (keyed by shift)
+RAYS = {shift: build_rays(shift, mask) for shift, mask in BISHOP_DIRECTIONS + ROOK_DIRECTIONS}
+
+# Rays are split by whether the direction goes towards h8 (positive shift) or a1.
+# The first blocker on a positive ray is its lowest set bit and on a negative ray its highest,
+# and everything past the blocker is the blocker's own ray in the same direction
+POSITIVE_BISHOP_RAYS = [RAYS[shift] for shift, _ in BISHOP_DIRECTIONS if shift > 0]
+NEGATIVE_BISHOP_RAYS = [RAYS[shift] for shift, _ in BISHOP_DIRECTIONS if shift < 0]
+POSITIVE_ROOK_RAYS = [RAYS[shift] for shift, _ in ROOK_DIRECTIONS if shift > 0]
+NEGATIVE_ROOK_RAYS = [RAYS[shift] for shift, _ in ROOK_DIRECTIONS if shift < 0]
+
+
+def bishop_attacks_from(square: int, occupied: int) -> int:
+    attacks = 0
+    for rays in POSITIVE_BISHOP_RAYS:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in NEGATIVE_BISHOP_RAYS:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks_from(square: int, occupied: int) -> int:
+    attacks = 0
+    for rays in POSITIVE_ROOK_RAYS:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in NEGATIVE_ROOK_RAYS:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def queen_attacks_from(square: int, occupied: int) -> int:
+    return bishop_attacks_from(square, occupied) | rook_attacks_from(square, occupied)
+
+
+def build_line_tables() -> 'tuple[List[List[int]], List[List[int]]]':
+    # between[a][b]: squares strictly between a and b if they share a rank, file or diagonal
+    # line[a][b]: the whole rank, file or diagonal through a and b (including both)
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for shift, rays in RAYS.items():
+        for square in range(64):
+            whole_line = rays[square] | RAYS[-shift][square] | (1 << square)
+            for to_square in range(64):
+                if rays[square] >> to_square & 1:
+                    between[square][to_square] = rays[square] ^ rays[to_square] ^ (1 << to_square)
+                    line[square][to_square] = whole_line
+    return between, line
+
+
+BETWEEN, LINE = build_line_tables()
@@ -0,0 +1,104 @@
+from typing import Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import LocType, ColourType
+
+# Squares are numbered 0-63 with square = row * 8 + col, so bit 0 is a1 (loc (0, 0))
+# and bit 63 is h8 (loc (7, 7)). Moving "up" the board (white's direction) is a left shift by 8.
+FULL_BOARD = 0xFFFF_FFFF_FFFF_FFFF
+FILE_A = 0x0101_0101_0101_0101
+FILE_B = FILE_A << 1
+FILE_G = FILE_A << 6
+FILE_H = FILE_A << 7
+RANK_1 = 0xFF
+RANK_2 = RANK_1 << 8
+RANK_7 = RANK_1 << 48
+RANK_8 = RANK_1 << 56
+NOT_FILE_A = FULL_BOARD ^ FILE_A
+NOT_FILE_H = FULL_BOARD ^ FILE_H
+NOT_FILE_AB = FULL_BOARD ^ (FILE_A | FILE_B)
+NOT_FILE_GH = FULL_BOARD ^ (FILE_G | FILE_H)
+DARK_SQUARES = 0xAA55_AA55_AA55_AA55  # a1 is dark, same as utilities.colour_of_square
+
+
+def square_of(loc: 'LocType') -> int:
+    return loc[0] * 8 + loc[1]
+
+
+def loc_of(square: int) -> 'LocType':
+    return (square >> 3, square & 7)
+
+
+def squares_of(bitboard: int) -> Iterator[int]:
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        yield lowest_bit.bit_length() - 1
+        bitboard ^= lowest_bit
+
+
+# The attack functions below are set-wise: they take a bitboard of (possibly many) pieces
+# and return every square attacked by any of them, using only shifts and masks.
+def knight_attacks(knights: int) -> int:
+    one_left = (knights >> 1) & NOT_FILE_H
+    two_left = (knights >> 2) & NOT_FILE_GH
+    one_right = (knights << 1) & NOT_FILE_A
+    two_right = (knights << 2) & NOT_FILE_AB
+    one_across = one_left | one_right
+    two_across = two_left | two_right
+    return (
+        (one_across << 16) | (one_across >> 16) | (two_across << 8) | (two_across >> 8)
+    ) & FULL_BOARD
+
+
+def king_attacks(kings: int) -> int:
+    attacks = ((kings << 1) & NOT_FILE_A) | ((kings >> 1) & NOT_FILE_H)
+    row = kings | attacks
+    return (attacks | (row << 8) | (row >> 8)) & FULL_BOARD
+
+
+def pawn_attacks(pawns: int, colour: 'ColourType') -> int:
+    if colour == 'white':
+        return (((pawns << 9) & NOT_FILE_A) | ((pawns << 7) & NOT_FILE_H)) & FULL_BOARD
+    return ((pawns >> 7) & NOT_FILE_A) | ((pawns >> 9) & NOT_FILE_H)
+
+
+# (shift, mask) pairs - a positive shift moves pieces towards h8, the mask removes squares
+# that a piece could only reach by wrapping around the edge of the board
+ROOK_DIRECTIONS = ((8, FULL_BOARD), (-8, FULL_BOARD), (1, NOT_FILE_A), (-1, NOT_FILE_H))
+BISHOP_DIRECTIONS = ((9, NOT_FILE_A), (7, NOT_FILE_H), (-7, NOT_FILE_A), (-9, NOT_FILE_H))
+
+
+def slide(sliders: int, empty: int, shift: int, mask: int) -> int:
+    # Kogge-Stone occluded fill: floods the sliders through empty squares in one direction,
+    # then shifts once more so the first blocker in each ray is included
+    propagator = empty & mask
+    if shift > 0:
+        sliders |= propagator & (sliders << shift)
+        propagator &= propagator << shift
+        sliders |= propagator & (sliders << (shift * 2))
+        propagator &= propagator << (shift * 2)
+        sliders |= propagator & (sliders << (shift * 4))
+        return (sliders << shift) & mask
+    shift = -shift
+    sliders |= propagator & (sliders >> shift)
+    propagator &= propagator >> shift
+    sliders |= propagator & (sliders >> (shift * 2))
+    propagator &= propagator >> (shift * 2)
+    sliders |= propagator & (sliders >> (shift * 4))
+    return (sliders >> shift) & mask
+
+
+def bishop_attacks(bishops: int, occupied: int) -> int:
+    empty = FULL_BOARD ^ occupied
+    attacks = 0
+    for shift, mask in BISHOP_DIRECTIONS:
+        attacks |= slide(bishops, empty, shift, mask)
+    return attacks
+
+
+def rook_attacks(rooks: int, occupied: int) -> int:
+    empty = FULL_BOARD ^ occupied
+    attacks = 0
+    for shift, mask in ROOK_DIRECTIONS:
+        attacks |= slide(rooks, empty, shift, mask)
+    return attacks
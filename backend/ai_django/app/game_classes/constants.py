@@ -33,3 +33,12 @@ SPECIAL_MOVES = (
     PROMOTE_TO_ROOK,
     PROMOTE_TO_QUEEN
 )
+
+PIECE_VALUES = {
+    PAWNS: 1,
+    KNIGHTS: 3,
+    BISHOPS: 3,
+    ROOKS: 5,
+    QUEENS: 9,
+    KINGS: 0
+}
@@ -3,14 +3,20 @@ from .player import Player
 from .game_logic import Logic
 from .utilities import get_board_string, get_board_representation
 from .move import Move
-from .ai import ChessAI, GameState, TreeNode
+from .ai import ChessAI, TreeNode
 from .game_status import GameStatus
-from typing import TYPE_CHECKING
+from .position import Position
+from .bitboards import square_of, loc_of
+from .move_encoding import encode_move, from_square_of, to_square_of, special_move_of
+from . import settings
+from typing import Dict, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .types import (
         BoardType,
-        MoveType,
+        PlayerType,
+        PieceCollectionType,
+        PositionMoveType,
         LocType,
         MaterialType,
         MoveHisType,
@@ -20,32 +26,77 @@ from .constants import PIECE_TYPES
 PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
 
 
+STARTING_PIECE_COUNTS = {PAWNS: 8, KNIGHTS: 2, BISHOPS: 2, ROOKS: 2, QUEENS: 1}
+
+
 class Game:
-    def __init__(self) -> None:
-        self.white_player = Player('white')
+    # starts from the position in fen if there is one (see from_fen), otherwise the start position
+    def __init__(self, fen: 'str | None' = None) -> None:
+        position = None if fen is None else Position.from_fen(fen)
+        if position is None:
+            self.white_player = Player('white')
+            self.black_player = Player('black')
+        else:
+            self.white_player = Player.from_position('white', position)
+            self.black_player = Player.from_position('black', position)
         self.white_pieces = self.white_player.pieces
-        self.black_player = Player('black')
         self.black_pieces = self.black_player.pieces
         self.players = (self.white_player, self.black_player)
         self.player_pieces = (self.white_player.pieces, self.black_player.pieces)
         self.move_history: 'MoveHisType' = []
-        self.material: 'MaterialType' = {
-            'white': {PAWNS: 0, KNIGHTS: 0, BISHOPS: 0, ROOKS: 0, QUEENS: 0},
-            'black': {PAWNS: 0, KNIGHTS: 0, BISHOPS: 0, ROOKS: 0, QUEENS: 0},
-        }
-        self.board = self.setup_board()
-        self.board_str = get_board_string(self.board)
+        if position is None:
+            self.material: 'MaterialType' = {
+                'white': {PAWNS: 0, KNIGHTS: 0, BISHOPS: 0, ROOKS: 0, QUEENS: 0},
+                'black': {PAWNS: 0, KNIGHTS: 0, BISHOPS: 0, ROOKS: 0, QUEENS: 0},
+            }
+            self.board = self.setup_board()
+            self.position = Position.from_players(self.white_player, self.black_player, self.move_history)
+        else:
+            self.material = Game.get_material_from_pieces(self.white_pieces, self.black_pieces)
+            self.board = Logic.get_board_from_pieces(self.white_pieces, self.black_pieces)
+            self.position = position
         self.game_status: 'GameStatusType' = GameStatus()
-
-        game_state = GameState(
-            self.board,
-            self.move_history,
-            self.material,
-            self.white_player,
-            self.black_player,
-            self.game_status
-        )
-        self.move_tree = TreeNode(game_state)
+        self.move_tree = TreeNode(ChessAI.get_game_state(self.position, self.game_status))
+        # the transposition table is shared by every game, and its scores from another game can be out
+        # of date or depend on that game's moves (draws by repetition)
+        ChessAI.clear_search_memory()
+
+    # Sets up the pieces, board, material and position straight from the FEN, without any
+    # move history, and calculates the legal moves and game status
+    @staticmethod
+    def from_fen(fen: str) -> 'Game':
+        game = Game(fen)
+        game.calculate_legal_moves()
+        player = game.players[game.position.side_to_move == 'black']
+        game.game_status = Logic.get_position_status(game.position, player.num_legal_moves)
+        game.move_tree = TreeNode(ChessAI.get_game_state(game.position, game.game_status))
+        return game
+
+    def to_fen(self) -> str:
+        return self.position.to_fen()
+
+    # The material make_move would have counted in a game that got to these pieces with
+    # only plain captures and promotions: a player gets a point for each opponent piece missing
+    # since the start, one for each of their own promoted pieces, and a pawn for each pawn the
+    # opponent no longer has (captured or promoted)
+    @staticmethod
+    def get_material_from_pieces(
+        white_pieces: 'PieceCollectionType',
+        black_pieces: 'PieceCollectionType'
+    ) -> 'MaterialType':
+        material: 'MaterialType' = {'white': {}, 'black': {}}  # type: ignore
+        for colour, pieces, opponent_pieces in (
+            ('white', white_pieces, black_pieces), ('black', black_pieces, white_pieces)
+        ):
+            for piece_type, starting_count in STARTING_PIECE_COUNTS.items():
+                if piece_type == PAWNS:
+                    material[colour][PAWNS] = starting_count - len(opponent_pieces[PAWNS])
+                    continue
+                material[colour][piece_type] = (
+                    max(0, starting_count - len(opponent_pieces[piece_type]))
+                    + max(0, len(pieces[piece_type]) - starting_count)
+                )
+        return material
 
     def setup_board(self) -> 'BoardType':
         return [
@@ -79,46 +130,36 @@ class Game:
 
     def calculate_legal_moves(self) -> None:
         Logic.calculate_moves_for_both_players(
-            self.white_player, self.black_player, self.board, self.move_history, self.material, self.board_str
+            self.position, self.white_player, self.black_player
         )
 
     def make_move(self, from_loc: 'LocType', to_loc: 'LocType', special_move: 'str | None' = None):
-        player_index = len(self.move_history) % 2
+        player_index = 0 if self.position.side_to_move == 'white' else 1
         self.game_status = Logic.make_move(
+            self.position,
             self.board,
             self.players[player_index],
             self.players[1-player_index],
             self.move_history,
             self.material,
-            Move(from_loc, to_loc, self.board, self.board_str, special_move),
-            self.board_str
+            Move(from_loc, to_loc, self.board, self.position.hash, special_move)
         )
-        self.board_str = get_board_string(self.board)
-
-        if self.move_tree is not None:
-            for child_state in self.move_tree.children.values():
-                move_made = child_state.move_before_current_state
-                assert move_made is not None
-                if (
-                    move_made.from_loc == from_loc
-                    and move_made.to_loc == to_loc
-                    and move_made.special_move == special_move
-                    and move_made.colour == self.players[player_index].colour
-                ):
-                    self.move_tree = child_state
-                    return
-
-    def update_move_tree(self, depth):
-        player_index = len(self.move_history) % 2
-        game_state = GameState(
-            self.board,
-            self.move_history,
-            self.material,
-            self.players[player_index],
-            self.players[1-player_index],
-            self.game_status
-        )
-        self.move_tree = TreeNode(game_state)
+
+        if (
+            self.move_tree is not None
+            and self.move_tree.game_state_after_move.colour == self.players[player_index].colour
+        ):
+            move_made = encode_move(square_of(from_loc), square_of(to_loc), special_move)
+            if move_made in self.move_tree.children:
+                self.move_tree = self.move_tree.children[move_made]
+
+    # searches to depth, or with iterative deepening for movetime_ms (and to at most depth, if
+    # it's given too)
+    def update_move_tree(self, depth=None, movetime_ms=None):
+        self.move_tree = TreeNode(ChessAI.get_game_state(self.position, self.game_status))
+        if movetime_ms is not None:
+            self.move_tree = ChessAI.iterative_deepening(self.move_tree, movetime_ms, max_depth=depth)
+            return
         self.move_tree = ChessAI.calculate_deep_moves(
             self.move_tree,
             depth,
@@ -128,32 +169,30 @@ class Game:
         if self.move_tree is None or self.move_tree.best_move is None:
             raise Exception('Cannot make best move before updating the move tree')
 
-        if len(self.move_history) == 0 or self.move_history[-1].colour != self.move_tree.best_move.colour:
-            move = self.move_tree.best_move
-            self.make_move(move.from_loc, move.to_loc, move.special_move)
-            return move.from_loc, move.to_loc, move.special_move
-
-        last_move = self.move_history[-1]
-
-        for child_state in self.move_tree.children.values():
-            move_made = child_state.move_before_current_state
-            assert move_made is not None
-            if (
-                move_made.from_loc == last_move.from_loc
-                and move_made.to_loc == last_move.to_loc
-                and move_made.special_move == last_move.special_move
-                and move_made.colour == last_move.colour
-            ):
-                best_move = child_state.best_move
-                assert best_move is not None
-                self.make_move(best_move.from_loc, best_move.to_loc, best_move.special_move)
-                return best_move.from_loc, best_move.to_loc, best_move.special_move
-
-        raise Exception('Could not find move made in the move tree')
+        tree_colour = self.move_tree.game_state_after_move.colour
+        if len(self.move_history) == 0 or self.move_history[-1].colour != tree_colour:
+            best_move = self.move_tree.best_move
+        else:
+            last_move = self.move_history[-1]
+            move_made = last_move.get_position_move()
+            if move_made not in self.move_tree.children:
+                raise Exception('Could not find move made in the move tree')
+            best_move = self.move_tree.children[move_made].best_move
+            assert best_move is not None
+
+        from_loc, to_loc, special_move = (
+            loc_of(from_square_of(best_move)), loc_of(to_square_of(best_move)), special_move_of(best_move)
+        )
+        self.make_move(from_loc, to_loc, special_move)
+        return from_loc, to_loc, special_move
 
     def get_all_legal_moves(self):
 
-        def get_move_info(move: 'MoveType'):
+        # Move objects (and their names, in debug mode) are only made here, for the API
+        def get_move_info(position_move: 'PositionMoveType', player: 'PlayerType'):
+            move = Move.from_position_move(position_move, self.board, self.position.hash)
+            if settings.debug:
+                move.ambiguous_from_locs = move.find_ambiguous_from_locs(player.pieces, self.position)
             return {
                 'from_loc': move.from_loc,
                 'to_loc': move.to_loc,
@@ -172,14 +211,21 @@ class Game:
                 legal_moves[player.colour][piece_type] = []
                 for piece in player.pieces[piece_type]:
                     legal_moves[player.colour][piece_type].append(
-                        [get_move_info(move) for move in piece.legal_moves]
+                        [get_move_info(move, player) for move in piece.legal_moves]
                     )
             legal_moves[player.colour][KINGS][0] = [
-                get_move_info(move) for move in player.pieces[KINGS][0].legal_moves
+                get_move_info(move, player) for move in player.pieces[KINGS][0].legal_moves
             ]
 
         return legal_moves
 
+    # see Position.perft / Position.divide and perft.py
+    def perft(self, depth: int) -> int:
+        return self.position.perft(depth)
+
+    def divide(self, depth: int) -> 'Dict[PositionMoveType, int]':
+        return self.position.divide(depth)
+
     def __str__(self) -> str:
         return get_board_string(self.board)
 
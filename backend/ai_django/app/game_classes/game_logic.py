@@ -1,6 +1,5 @@
-from .utilities import (
-    in_bounds, colour_of_square, get_board_string
-)
+from .position import OTHER_COLOUR
+from . import settings
 from .game_errors import (
     InvalidStartPosError,
     InvalidPlayerError,
@@ -9,7 +8,7 @@ from .game_errors import (
     InternalInvalidPlayerError,
     InternalIllegalMoveError
 )
-from typing import List, TYPE_CHECKING
+from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .types import (
@@ -20,12 +19,10 @@ if TYPE_CHECKING:
         MoveType,
         PieceCollectionType,
         PieceType,
-        DirectionType,
-        LocType,
-        GameStatusType
+        GameStatusType,
+        PositionType
     )
 
-from . import settings
 from .game_status import GameStatus
 from .pieces.knight import Knight
 from .pieces.bishop import Bishop
@@ -38,8 +35,6 @@ from .constants import (
     ENPASSANT_LEFT,
     ENPASSANT_RIGHT,
 )
-from .move import Move
-from .copy_game_objects import CopyGameObjects
 PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
 
 
@@ -48,94 +43,66 @@ PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
 class Logic:
     @staticmethod
     def calculate_moves_for_both_players(
+        position: 'PositionType',
         player: 'PlayerType',
         opponent: 'PlayerType',
-        board: 'BoardType',
-        move_history: 'MoveHisType',
-        material: 'MaterialType',
-        board_str: str,
-        check_checks: bool = True
+        check_checks: bool = True,
+        changed_squares: 'int | None' = None
     ):
-        for piece_type in PIECE_TYPES:
-            for piece in player.pieces[piece_type]:
-                piece.calculate_moves(board, move_history, board_str)
-            for piece in opponent.pieces[piece_type]:
-                piece.calculate_moves(board, move_history, board_str)
-
-        player_in_check = Logic.calculate_legal_moves(
-            player, opponent, board, move_history, material, board_str, check_checks
-        )
-        opponent_in_check = Logic.calculate_legal_moves(
-            opponent, player, board, move_history, material, board_str, check_checks
-        )
-
-        result = (player_in_check, opponent_in_check)
-
-        if not settings.debug:
-            return result
+        # changed_squares is a bitboard of the squares the last move changed, only pieces whose
+        # moves depend on one of them are regenerated. None regenerates every piece
+        if changed_squares is None or not settings.incremental_moves:
+            for piece_type in PIECE_TYPES:
+                for piece in player.pieces[piece_type]:
+                    piece.calculate_moves(position)
+                for piece in opponent.pieces[piece_type]:
+                    piece.calculate_moves(position)
+        else:
+            for piece_type in PIECE_TYPES:
+                for piece in player.pieces[piece_type]:
+                    if piece.moves_depend_on(changed_squares):
+                        piece.calculate_moves(position)
+                for piece in opponent.pieces[piece_type]:
+                    if piece.moves_depend_on(changed_squares):
+                        piece.calculate_moves(position)
 
-        def set_move_names(moves: List[Move], player_pieces: 'PieceCollectionType'):
-            for move in moves:
-                move.move_name = move.get_basic_move_name(player_pieces)
+        player_in_check = Logic.calculate_legal_moves(position, player, check_checks)
+        opponent_in_check = Logic.calculate_legal_moves(position, opponent, check_checks)
 
-        for piece_type in PIECE_TYPES:
-            for piece in player.pieces[piece_type]:
-                set_move_names(piece.legal_moves, player.pieces)
-            for piece in opponent.pieces[piece_type]:
-                set_move_names(piece.legal_moves, opponent.pieces)
-
-        return result
+        return (player_in_check, opponent_in_check)
 
     @staticmethod
     def calculate_legal_moves(
+        position: 'PositionType',
         player: 'PlayerType',
-        opponent: 'PlayerType',
-        board: 'BoardType',
-        move_history: 'MoveHisType',
-        material: 'MaterialType',
-        board_str: str,
         check_checks: bool = True
     ):
-        in_check = Logic.in_check(board, player, opponent, board_str)
+        in_check = Logic.in_check(position, player)
         player.num_legal_moves = 0
-
-        def helper(piece: 'PieceType'):
-            if not check_checks:
-                player.num_legal_moves += len(piece.legal_moves)
-                return
-            if in_check:
-                piece.legal_moves = list(filter(
-                    lambda move: (
-                        move.special_move != SHORT_CASTLE  # Can't castle when in check
-                        and move.special_move != LONG_CASTLE  # Can't castle when in check
-                        and not Logic.in_check_after_move(
-                            board, move_history, material, player, opponent, move, board_str
-                        )
-                    ),
-                    piece.legal_moves
-                ))
-            else:
-                Logic.validate_moves(board, move_history, material, piece, player, opponent, board_str)
-            player.num_legal_moves += len(piece.legal_moves)
+        legal_moves = set(position.legal_moves(player.colour)) if check_checks else None
 
         for piece_type in PIECE_TYPES:
             for piece in player.pieces[piece_type]:
-                helper(piece)
+                if legal_moves is not None:
+                    piece.legal_moves = [move for move in piece.pseudo_legal_moves if move in legal_moves]
+                else:
+                    piece.legal_moves = piece.pseudo_legal_moves
+                player.num_legal_moves += len(piece.legal_moves)
 
         return in_check
 
     @staticmethod
     # this method is in the Logic class instead of the Move class for flexibility
     # i.e. - you can pass in copied parameters and not have to worry about affecting
-    # the originals. See in_check_after_move for an example
+    # the originals
     def make_move(
+        position: 'PositionType',
         board: 'BoardType',
         player: 'PlayerType',
         opponent: 'PlayerType',
         move_history: 'MoveHisType',
         material: 'MaterialType',
         move: 'MoveType',
-        board_str: str,
         check_checks: bool = True
     ) -> 'GameStatusType':
         # set variables
@@ -152,12 +119,16 @@ class Logic:
         if piece.colour != player.colour:
             error = InvalidPlayerError if check_checks else InternalInvalidPlayerError
             raise error(piece.colour)
-        if move not in piece.legal_moves:
+        if move.get_position_move() not in piece.legal_moves:
             error = IllegalMoveError if check_checks else InternalIllegalMoveError
             raise error(
                 piece.colour, piece.get_name(), move.from_loc, move.to_loc, move.special_move
             )
 
+        # the name is only put together if the move is printed, this is all it needs from
+        # before the move
+        move.ambiguous_from_locs = move.find_ambiguous_from_locs(player.pieces, position)
+
         # set castling rights
         if piece.get_type() == KINGS:
             piece.short_castle_rights = False
@@ -223,6 +194,20 @@ class Logic:
             elif captured_piece.id == 1:
                 opponent.pieces[KINGS][0].short_castle_rights = False
 
+        occupied_before = position.occupied['white'], position.occupied['black']
+        ep_square_before = position.ep_square
+        position.make_move(move.get_position_move())
+
+        # the squares whose contents changed (from, to, a captured en-passant pawn, a castling rook)
+        # and any en-passant square that appeared or disappeared
+        changed_squares = (
+            (occupied_before[0] ^ position.occupied['white'])
+            | (occupied_before[1] ^ position.occupied['black'])
+        )
+        for ep_square in (ep_square_before, position.ep_square):
+            if ep_square is not None:
+                changed_squares |= 1 << ep_square
+
         # update move history
         move.move_num = len(move_history)
         move_history.append(move)
@@ -235,31 +220,26 @@ class Logic:
             material[player.colour][new_piece.get_type()] += 1
             material[opponent.colour][PAWNS] += 1
 
-        # TODO: get_basic_move_name is already called in calculate_moves_for_both_players when debug is on
-        move_name = move.get_basic_move_name(player.pieces)
-
         # update legal moves
         player_in_check, opponent_in_check = Logic.calculate_moves_for_both_players(
-            player, opponent, board, move_history, material, board_str, check_checks
+            position, player, opponent, check_checks, changed_squares
         )
 
         game_status = GameStatus(last_move_was_capture = is_capture)
         game_status.set_player_in_check(player.colour, player_in_check)
         game_status.set_player_in_check(opponent.colour, opponent_in_check)
 
-        move_name_suffix = '+' if opponent_in_check else ''
+        move.name_suffix = '+' if opponent_in_check else ''
         # check for checkmate
         if opponent_in_check and opponent.num_legal_moves == 0:
             game_status.game_finished = True
             game_status.game_result = 'checkmate'
             game_status.winner = player.colour
             game_status.game_result_message = f'{player.colour} won by checkmate'
-            move_name_suffix = '#'
-
-        move.move_name = move_name + move_name_suffix
+            move.name_suffix = '#'
 
         # check for draw
-        is_draw, draw_by = Logic.is_draw(board, player, opponent, move_history, opponent_in_check)
+        is_draw, draw_by = Logic.is_draw(position, opponent, opponent_in_check)
         if is_draw:
             game_status.game_finished = True
             game_status.game_result = 'draw'
@@ -271,78 +251,36 @@ class Logic:
     # checks 3-fold repetition, 50 move rule, insufficient mating material
     # should not be called before a move is made
     @staticmethod
-    def is_draw(
-        board: 'BoardType',
-        player: 'PlayerType',
-        opponent: 'PlayerType',
-        move_history: 'MoveHisType',
-        opponent_in_check: bool
-    ):
-        if not opponent_in_check and opponent.num_legal_moves == 0:
-            return (True, 'stalemate')
+    def is_draw(position: 'PositionType', opponent: 'PlayerType', opponent_in_check: bool):
+        # the position keeps the halfmove clock and repetition counts up to date as moves are made,
+        # so this doesn't have to walk back through the move history
+        return position.is_draw(opponent_in_check, opponent.num_legal_moves)
 
-        insuff_material = Logic.insufficient_mating_material([player, opponent])
-        if insuff_material:
-            return (True, 'insufficient material')
-
-        boards = {get_board_string(board): 1}
+    # same result as the end of make_move, for positions reached with Position.make_move
+    # (i.e. in the search) that have no Player/board objects to check
+    @staticmethod
+    def get_position_status(position: 'PositionType', num_legal_moves: int) -> 'GameStatusType':
+        colour = position.side_to_move
+        in_check = position.in_check(colour)
 
-        iterations = 0
-        for i in range(len(move_history) - 1, max(-1, len(move_history) - 100), -1):
-            if move_history[i].board_str_before_move in boards:
-                boards[move_history[i].board_str_before_move] += 1
-                if boards[move_history[i].board_str_before_move] >= 3:
-                    return (True, '3-fold repetition')
-            else:
-                boards[move_history[i].board_str_before_move] = 1
+        game_status = GameStatus()
+        game_status.set_player_in_check(colour, in_check)
 
-            assert move_history[i].is_capture is not None
-            if move_history[i].piece_type == PAWNS or move_history[i].is_capture:
-                return (False, None)
-            iterations += 1
+        if in_check and num_legal_moves == 0:
+            winner = OTHER_COLOUR[colour]
+            game_status.game_finished = True
+            game_status.game_result = 'checkmate'
+            game_status.winner = winner
+            game_status.game_result_message = f'{winner} won by checkmate'
 
-        return (True, '50-move rule') if iterations >= 50 else (False, None)
+        is_draw, draw_by = position.is_draw(in_check, num_legal_moves)
+        if is_draw:
+            game_status.game_finished = True
+            game_status.game_result = 'draw'
+            game_status.draw_by = draw_by
+            game_status.game_result_message = f'game drawn by {draw_by}'
 
-    # using lichess / FIDE rules, i.e. it's only a draw if there's absolutely no mate possible
-    # (it's not a draw if there is a possible mate even if there is no forced mate)
-    @staticmethod
-    def insufficient_mating_material(players: List['PlayerType']):
-        for i, player in enumerate(players):
-            if (
-                len(player.pieces[PAWNS]) > 0
-                or len(player.pieces[KNIGHTS]) >= 2
-                or len(player.pieces[ROOKS]) > 0
-                or len(player.pieces[QUEENS]) > 0
-            ):
-                return False
-            if (
-                len(player.pieces[KNIGHTS]) >= 1
-                and len(player.pieces[BISHOPS]) >= 1
-            ):
-                return False
-            if len(player.pieces[KNIGHTS]) >= 1 and (
-                len(players[1-i].pieces[KNIGHTS]) >= 1
-                or len(players[1-i].pieces[BISHOPS]) >= 1
-            ):
-                return False
-            if len(player.pieces[BISHOPS]) >= 2 and (
-                any(
-                    colour_of_square(bishop.loc) != colour_of_square(list(player.pieces[BISHOPS])[0].loc)
-                    for bishop in player.pieces[BISHOPS]
-                )
-            ):
-                return False
-            if (
-                len(player.pieces[BISHOPS]) >= 1
-                and len(players[1-i].pieces[BISHOPS]) >= 1
-                and any(
-                    colour_of_square(bishop.loc) != colour_of_square(list(player.pieces[BISHOPS])[0].loc)
-                    for bishop in (list(player.pieces[BISHOPS]) + list(players[1-i].pieces[BISHOPS]))
-                )
-            ):
-                return False
-
-        return True
+        return game_status
 
     @staticmethod
     def get_board_from_pieces(player_pieces: 'PieceCollectionType', opponent_pieces: 'PieceCollectionType') -> 'BoardType':
@@ -359,186 +297,7 @@ class Logic:
         return board
 
     @staticmethod
-    def in_check_after_move(
-            board: 'BoardType',
-            move_history: 'MoveHisType',
-            material: 'MaterialType',
-            player: 'PlayerType',
-            opponent: 'PlayerType',
-            move: 'MoveType',
-            board_str: str
-    ) -> bool:
-        from_loc = move.from_loc
-        to_loc = move.to_loc
-
-        temp_player = CopyGameObjects.copy_player(player)
-        temp_opponent = CopyGameObjects.copy_player(opponent)
-        temp_board = Logic.get_board_from_pieces(temp_player.pieces, temp_opponent.pieces)
-
-        Logic.make_move(
-            temp_board,
-            temp_player,
-            temp_opponent,
-            move_history,
-            CopyGameObjects.copy_material(material),
-            Move(from_loc, to_loc, temp_board, board_str, move.special_move),
-            board_str,
-            False
-        )
-
-        in_check = Logic.in_check(temp_board, temp_player, temp_opponent, board_str)
-
-        move_history.pop()
-
-        return in_check
-
-    # filters the pieces moves such that after the move is made, the player's king is not in check
-    # pre-condition: the king is not currently in check
-    @staticmethod
-    def validate_moves(
-        board: 'BoardType',
-        move_history: 'MoveHisType',
-        material: 'MaterialType',
-        piece: 'PieceType',
-        player: 'PlayerType',
-        opponent: 'PlayerType',
-        board_str: str
-    ):
-        if piece.get_type() == KINGS:
-            legal_moves = []
-            for move in piece.legal_moves:
-                moves_to_check = []
-                if move.special_move == SHORT_CASTLE:
-                    moves_to_check.append(Move(piece.loc, (piece.loc[0], piece.loc[1] + 1), board, board_str))
-                    moves_to_check.append(
-                        Move(piece.loc, (piece.loc[0], piece.loc[1] + 2), board, board_str, SHORT_CASTLE)
-                    )
-                elif move.special_move == LONG_CASTLE:
-                    moves_to_check.append(Move(piece.loc, (piece.loc[0], piece.loc[1] - 1), board, board_str))
-                    moves_to_check.append(
-                        Move(piece.loc, (piece.loc[0], piece.loc[1] - 2), board, board_str, LONG_CASTLE)
-                    )
-                else:
-                    moves_to_check.append(move)
-                i = 0
-                moves_are_legal = True
-                while (i < len(moves_to_check) and moves_are_legal):
-                    moves_are_legal = not Logic.in_check_after_move(
-                        board, move_history, material, player, opponent, moves_to_check[i], board_str
-                    )
-                    i += 1
-                if moves_are_legal:
-                    legal_moves.append(move)
-
-            player.pieces[KINGS][0].legal_moves = legal_moves
-            return
-
-        king_row, king_col = player.pieces[KINGS][0].loc
-
-        def validate_in_dir(x_dir: 'DirectionType', y_dir: 'DirectionType'):
-            def check_for_enpassent(piece: 'PieceType', loc: 'LocType', player: 'PlayerType', board: 'BoardType'):
-                if (
-                    piece.get_type() == PAWNS
-                    and loc[0] == piece.loc[0] + 1 * player.direction
-                    and loc[1] == piece.loc[1] - 1
-                ):
-                    return Move(piece.loc, loc, board, board_str, ENPASSANT_LEFT)
-                elif (
-                    piece.get_type() == PAWNS
-                    and loc[0] == piece.loc[0] + 1 * player.direction
-                    and loc[1] == piece.loc[1] + 1
-                ):
-                    return Move(piece.loc, loc, board, board_str, ENPASSANT_RIGHT)
-                return None
-
-            dist = 1
-            found_piece = False
-            empty_squares_between_king_and_piece = []
-            while in_bounds((loc := (king_row + y_dir * dist, king_col + x_dir * dist))):
-                board_loc = board[loc[0]][loc[1]]
-
-                if not found_piece and board_loc is not None and board_loc.colour != player.colour:
-                    return
-
-                elif found_piece and board_loc is not None and board_loc.colour == player.colour:
-                    return
-
-                elif not found_piece and board_loc is None:
-                    empty_squares_between_king_and_piece.append((loc[0], loc[1]))
-                elif (
-                    not found_piece
-                    and board_loc is not None
-                    and board_loc.colour == player.colour
-                ):
-                    found_piece = True
-                    piece = board_loc
-                    valid_moves = []
-                    for empty_loc in empty_squares_between_king_and_piece:
-                        valid_moves.append(Move(piece.loc, empty_loc, board, board_str))
-                        enpassent = check_for_enpassent(piece, empty_loc, player, board)
-                        if enpassent:
-                            valid_moves.append(enpassent)
-                    valid_moves = [
-                        Move(piece.loc, empty_loc, board, board_str) for empty_loc in empty_squares_between_king_and_piece
-                    ]
-
-                elif found_piece and board_loc is None:
-                    valid_moves.append(Move(piece.loc, loc, board, board_str))
-                    enpassent = check_for_enpassent(piece, loc, player, board)
-                    if enpassent:
-                        valid_moves.append(enpassent)
-
-                elif found_piece and board_loc is not None and board_loc.colour != player.colour:
-                    piece_type = board_loc.get_type()
-                    if (
-                        piece_type == QUEENS
-                        or ((x_dir == 0 or y_dir == 0) and piece_type == ROOKS)
-                        or (x_dir != 0 and y_dir != 0 and piece_type == BISHOPS)
-                    ):
-                        valid_moves.append(Move(piece.loc, loc, board, board_str))
-                        piece.legal_moves = list(filter(
-                            lambda move: move in valid_moves,
-                            piece.legal_moves
-                        ))
-                    else:
-                        return
-                dist += 1
-
-        for x_dir in (0, 1, -1):
-            for y_dir in (0, 1, -1):
-                if x_dir == 0 and y_dir == 0:
-                    continue
-                validate_in_dir(x_dir, y_dir)
-
-    @staticmethod
-    def in_check(board: 'BoardType', player: 'PlayerType', opponent: 'PlayerType', board_str: str) -> bool:
-        # Might want to reimplement by calculating lines from the king (and knight paths)
-        # Why? Average branching-factor (i.e. number of legal moves in a position) is 35
-        # Number of squares needed using lines is also 35 but that's in the worst case
-        # so it could improve performance
-        for piece_type in [KNIGHTS, BISHOPS, ROOKS, QUEENS]:
-            for piece in opponent.pieces[piece_type]:
-                if Move(piece.loc, player.pieces[KINGS][0].loc, board, board_str) in piece.legal_moves:
-                    return True
-
-        # the other King can't actually put the player in check
-        # this is simply to prevent the kings from being adjacent
-        if (Move(opponent.pieces[KINGS][0].loc, player.pieces[KINGS][0].loc, board, board_str)
-                in opponent.pieces[KINGS][0].legal_moves):
-            return True
-
-        left_diag = (player.pieces[KINGS][0].row + 1 * player.direction, player.pieces[KINGS][0].col - 1)
-        right_diag = (player.pieces[KINGS][0].row + 1 * player.direction, player.pieces[KINGS][0].col + 1)
-
-        for loc in (left_diag, right_diag):
-            if not in_bounds(loc):
-                continue
-            board_at_loc = board[loc[0]][loc[1]]
-            if (
-                board_at_loc is not None
-                and board_at_loc.colour != player.colour
-                and board_at_loc.get_type() == PAWNS
-            ):
-                return True
-
-        return False
+    def in_check(position: 'PositionType', player: 'PlayerType') -> bool:
+        # the opponent's attacks are a union of bitboards, so this doesn't depend on
+        # the opponent's legal moves having been calculated
+        return position.in_check(player.colour)
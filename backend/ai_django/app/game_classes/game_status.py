@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Any, Dict, Literal
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -7,6 +7,17 @@ if TYPE_CHECKING:
     )
 
 class GameStatus:
+    __slots__ = (
+        'game_finished',
+        'white_in_check',
+        'black_in_check',
+        'last_move_was_capture',
+        'game_result',
+        'winner',
+        'game_result_message',
+        'draw_by'
+    )
+
     def __init__(
             self,
             game_finished: bool = False,
@@ -28,12 +39,19 @@ class GameStatus:
         self.game_result_message = game_result_message
         self.draw_by = draw_by
 
+    # what vars() would have given without __slots__, for JSON responses
+    def to_dict(self) -> 'Dict[str, Any]':
+        return {name: getattr(self, name) for name in GameStatus.__slots__}
+
     def set_player_in_check(self, colour: 'ColourType', in_check: bool):
         if colour == 'white':
             self.white_in_check = in_check
         else:
             self.black_in_check = in_check
 
+    def is_player_in_check(self, colour: 'ColourType') -> bool:
+        return self.white_in_check if colour == 'white' else self.black_in_check
+
     def __str__(self) -> str:
         return f'''game_finished: {self.game_finished}
         game_result: {self.game_result}
@@ -1,38 +1,61 @@
 from .utilities import loc_to_chess_notation, get_board_string, index_to_letter
+from .bitboards import square_of, loc_of
+from .move_encoding import encode_move, from_square_of, to_square_of, special_move_of
 from .constants import (
     SHORT_CASTLE,
     LONG_CASTLE,
     ENPASSANT_LEFT,
     ENPASSANT_RIGHT,
 )
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .types import (
         BoardType,
         MoveType,
         PieceCollectionType,
-        LocType
+        LocType,
+        PositionMoveType,
+        PositionType
     )
 from .constants import PIECE_TYPES
 PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
 
 
 class Move:
+    __slots__ = (
+        'from_loc',
+        'to_loc',
+        'special_move',
+        '_move_name',
+        'ambiguous_from_locs',
+        'name_suffix',
+        'hash_before_move',
+        'move_num',
+        'piece_type',
+        'piece_id',
+        'colour',
+        'is_capture'
+    )
+
     def __init__(
             self,
             from_loc: 'LocType',
             to_loc: 'LocType',
             board_before_move: 'BoardType',
-            board_str_before_move: str,
+            hash_before_move: int,
             special_move: 'None | str' = None
     ):
         self.from_loc = from_loc
         self.to_loc = to_loc
         self.special_move = special_move
-        self.id = str(self.from_loc) + str(self.to_loc) + str(self.special_move)
-        self.move_name: 'None | str' = None
-        self.board_str_before_move = board_str_before_move
+        # The name is only worked out when the move is printed. Until ambiguous_from_locs is set
+        # (by Logic.make_move, or for the API in debug mode) the move has no name
+        self._move_name: 'None | str' = None
+        # locations of the player's other pieces that could have moved to to_loc
+        self.ambiguous_from_locs: 'None | List[LocType]' = None
+        self.name_suffix = ''  # + or #
+        self.hash_before_move = hash_before_move  # Position.hash
         self.move_num = -1  # index of move history - set in Logic.make_move()
 
         if board_before_move[from_loc[0]][from_loc[1]] is None:
@@ -48,9 +71,31 @@ class Move:
         captured_piece = self.get_captured_piece(board_before_move)
         self.is_capture = captured_piece is not None
 
-        self.promotion_piece = None
-        if special_move is not None and special_move.startswith('promote'):
-            self.promotion_piece = special_move.split(':')[1]
+    @staticmethod
+    def from_position_move(
+        move: 'PositionMoveType',
+        board_before_move: 'BoardType',
+        hash_before_move: int
+    ) -> 'Move':
+        return Move(
+            loc_of(from_square_of(move)),
+            loc_of(to_square_of(move)),
+            board_before_move,
+            hash_before_move,
+            special_move_of(move)
+        )
+
+    @property
+    def promotion_piece(self) -> 'str | None':
+        if self.special_move is not None and self.special_move.startswith('promote'):
+            return self.special_move.split(':')[1]
+        return None
+
+    @property
+    def move_name(self) -> 'str | None':
+        if self._move_name is None and self.ambiguous_from_locs is not None:
+            self._move_name = self.get_basic_move_name() + self.name_suffix
+        return self._move_name
 
     def __str__(self) -> str:
         if self.move_name is not None:
@@ -76,6 +121,10 @@ class Move:
             and self.special_move == other.special_move
         )
 
+    # the same move encoded for Position (see move_encoding.py)
+    def get_position_move(self) -> 'PositionMoveType':
+        return encode_move(square_of(self.from_loc), square_of(self.to_loc), self.special_move)
+
     def get_captured_piece(self, board: 'BoardType'):
         from_loc = self.from_loc
         to_loc = self.to_loc
@@ -93,21 +142,42 @@ class Move:
 
         return None
 
+    # player_pieces' legal moves have to be from before the move is made. If position is given
+    # (also from before the move), pieces that can't reach to_loc at all are skipped without
+    # looking through their moves - usually that's all of them
+    def find_ambiguous_from_locs(
+        self,
+        player_pieces: 'PieceCollectionType',
+        position: 'PositionType | None' = None
+    ) -> 'List[LocType]':
+        piece_type = self.piece_type
+        if piece_type not in (KNIGHTS, BISHOPS, ROOKS, QUEENS):
+            return []
+        to_square = square_of(self.to_loc)
+        if position is not None:
+            reaching_pieces = (
+                position.attacks_from(piece_type, self.colour, to_square) & position.pieces[self.colour][piece_type]
+            )
+            if reaching_pieces & (reaching_pieces - 1) == 0:
+                return []
+
+        ambiguous_from_locs = []
+        for piece in player_pieces[piece_type]:
+            if (
+                piece.id != self.piece_id
+                and any(to_square_of(other_move) == to_square for other_move in piece.legal_moves)
+            ):
+                ambiguous_from_locs.append(piece.loc)
+        return ambiguous_from_locs
+
     # returns the move name without any suffixes like + or #
-    def get_basic_move_name(self, player_pieces: 'PieceCollectionType') -> str:
+    def get_basic_move_name(self) -> str:
         if self.special_move in (SHORT_CASTLE, LONG_CASTLE):
             return self.special_move
 
         piece_type = self.piece_type
 
-        extra_potential_from_locs = []
-        if piece_type in (KNIGHTS, BISHOPS, ROOKS, QUEENS):
-            for piece in player_pieces[piece_type]:
-                if (
-                    piece.id != self.piece_id
-                    and any(other_move.to_loc == self.to_loc for other_move in piece.legal_moves)
-                ):
-                    extra_potential_from_locs.append(piece.loc)
+        extra_potential_from_locs = self.ambiguous_from_locs or []
         same_file_exists = False
         same_rank_exists = False
         for loc in extra_potential_from_locs:
@@ -0,0 +1,72 @@
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import PositionMoveType
+
+from .constants import (
+    SHORT_CASTLE,
+    LONG_CASTLE,
+    ENPASSANT_LEFT,
+    ENPASSANT_RIGHT,
+    PROMOTE_TO_QUEEN,
+    PROMOTE_TO_ROOK,
+    PROMOTE_TO_BISHOP,
+    PROMOTE_TO_KNIGHT
+)
+from .bitboards import loc_of
+from .utilities import loc_to_chess_notation
+
+# Moves inside the engine are ints: bits 0-5 are the from square, bits 6-11 the to square and
+# bits 12-15 a flag for the special move (0 if there isn't one). Everything else about a move
+# (the moving piece, its colour, what it captures, its name) is looked up on the position or
+# board when it's needed, and Move objects are only built for the API.
+NO_FLAG = 0
+# passing the turn (see Position.make_null_move). From a1 to a1, which no real move is
+NULL_MOVE = 0
+SHORT_CASTLE_FLAG = 1
+LONG_CASTLE_FLAG = 2
+ENPASSANT_LEFT_FLAG = 3
+ENPASSANT_RIGHT_FLAG = 4
+PROMOTE_TO_QUEEN_FLAG = 5
+PROMOTE_TO_ROOK_FLAG = 6
+PROMOTE_TO_BISHOP_FLAG = 7
+PROMOTE_TO_KNIGHT_FLAG = 8
+
+# indexed by flag
+FLAG_SPECIAL_MOVES: 'List[str | None]' = [
+    None,
+    SHORT_CASTLE,
+    LONG_CASTLE,
+    ENPASSANT_LEFT,
+    ENPASSANT_RIGHT,
+    PROMOTE_TO_QUEEN,
+    PROMOTE_TO_ROOK,
+    PROMOTE_TO_BISHOP,
+    PROMOTE_TO_KNIGHT
+]
+SPECIAL_MOVE_FLAGS = {special_move: flag for flag, special_move in enumerate(FLAG_SPECIAL_MOVES)}
+
+
+def encode_move(from_square: int, to_square: int, special_move: 'str | None' = None) -> 'PositionMoveType':
+    return from_square | to_square << 6 | SPECIAL_MOVE_FLAGS[special_move] << 12
+
+
+def from_square_of(move: 'PositionMoveType') -> int:
+    return move & 63
+
+
+def to_square_of(move: 'PositionMoveType') -> int:
+    return move >> 6 & 63
+
+
+def special_move_of(move: 'PositionMoveType') -> 'str | None':
+    return FLAG_SPECIAL_MOVES[move >> 12]
+
+
+# long algebraic notation, e.g. e2e4 or e7e8q
+def uci_string_of(move: 'PositionMoveType') -> str:
+    special_move = special_move_of(move)
+    promotion = ''
+    if special_move is not None and special_move.startswith('promote'):
+        promotion = special_move.split(':')[1].lower()
+    return loc_to_chess_notation(loc_of(move & 63)) + loc_to_chess_notation(loc_of(move >> 6 & 63)) + promotion
@@ -0,0 +1,36 @@
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import ColourType, PositionMoveType
+
+# deeper than the search ever goes, killers past it aren't kept
+MAX_PLY = 64
+
+
+# What the search has learnt about quiet moves, for ordering them (see Position.staged_legal_moves):
+# - killers: the last two quiet moves that caused a beta cutoff at each ply, tried straight after
+#   the captures, since a move that refutes one position often refutes its siblings too
+# - history: a butterfly table (indexed by the move's from and to squares) for each side, that
+#   gets depth * depth added whenever a quiet move causes a cutoff. The rest of the quiet moves
+#   are tried highest history first
+class MoveOrdering:
+    def __init__(self) -> None:
+        self.killers: 'List[List[PositionMoveType | None]]' = [[None, None] for _ in range(MAX_PLY)]
+        self.history: 'Dict[ColourType, List[int]]' = {'white': [0] * 4096, 'black': [0] * 4096}
+
+    def clear(self) -> None:
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = {'white': [0] * 4096, 'black': [0] * 4096}
+
+    # called at the start of each search, so old cutoffs count for less than new ones
+    def age(self) -> None:
+        for colour, history in self.history.items():
+            self.history[colour] = [score >> 1 for score in history]
+
+    def update(self, colour: 'ColourType', move: 'PositionMoveType', depth: int, ply: int) -> None:
+        self.history[colour][move & 4095] += depth * depth
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
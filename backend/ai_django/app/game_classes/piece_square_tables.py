@@ -0,0 +1,152 @@
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import ColourType
+
+from .constants import PIECE_TYPES
+PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
+
+# Piece-square tables for the tapered evaluation, in centipawns. Values are from the
+# "Simplified Evaluation Function" on the chessprogramming wiki, plus endgame tables for pawns
+# (push them) and the king (centralise it). Tables are written as white sees the board, so the
+# first row is rank 8 - for black they're mirrored.
+MIDDLEGAME_PIECE_VALUES = {PAWNS: 100, KNIGHTS: 320, BISHOPS: 330, ROOKS: 500, QUEENS: 900, KINGS: 0}
+ENDGAME_PIECE_VALUES = {PAWNS: 120, KNIGHTS: 300, BISHOPS: 320, ROOKS: 520, QUEENS: 920, KINGS: 0}
+
+_PAWN_MIDDLEGAME = [
+    0,   0,   0,   0,   0,   0,   0,   0,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    10,  10,  20,  30,  30,  20,  10,  10,
+    5,   5,  10,  25,  25,  10,   5,   5,
+    0,   0,   0,  20,  20,   0,   0,   0,
+    5,  -5, -10,   0,   0, -10,  -5,   5,
+    5,  10,  10, -20, -20,  10,  10,   5,
+    0,   0,   0,   0,   0,   0,   0,   0,
+]
+_PAWN_ENDGAME = [
+    0,   0,   0,   0,   0,   0,   0,   0,
+    80,  80,  80,  80,  80,  80,  80,  80,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    30,  30,  30,  30,  30,  30,  30,  30,
+    20,  20,  20,  20,  20,  20,  20,  20,
+    10,  10,  10,  10,  10,  10,  10,  10,
+    0,   0,   0,   0,   0,   0,   0,   0,
+    0,   0,   0,   0,   0,   0,   0,   0,
+]
+_KNIGHT = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+_BISHOP = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+_ROOK = [
+    0,   0,   0,   0,   0,   0,   0,   0,
+    5,  10,  10,  10,  10,  10,  10,   5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    0,   0,   0,   5,   5,   0,   0,   0,
+]
+_QUEEN = [
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+    -5,   0,   5,   5,   5,   5,   0,  -5,
+    0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+]
+_KING_MIDDLEGAME = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20,  20,   0,   0,   0,   0,  20,  20,
+    20,  30,  10,   0,   0,  10,  30,  20,
+]
+_KING_ENDGAME = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]
+_TABLES = {
+    PAWNS: (_PAWN_MIDDLEGAME, _PAWN_ENDGAME),
+    KNIGHTS: (_KNIGHT, _KNIGHT),
+    BISHOPS: (_BISHOP, _BISHOP),
+    ROOKS: (_ROOK, _ROOK),
+    QUEENS: (_QUEEN, _QUEEN),
+    KINGS: (_KING_MIDDLEGAME, _KING_ENDGAME),
+}
+
+# The game phase goes from MAX_PHASE with every piece on the board down to 0 with only kings and
+# pawns left, and the evaluation slides from the middlegame score to the endgame score with it
+PHASE_WEIGHTS = {PAWNS: 0, KNIGHTS: 1, BISHOPS: 1, ROOKS: 2, QUEENS: 4, KINGS: 0}
+MAX_PHASE = 24
+
+# The middlegame and endgame scores are packed into one int, middlegame + endgame * SCORE_SHIFT,
+# so keeping both up to date is a single addition. Both halves stay well under SCORE_SHIFT / 2
+SCORE_SHIFT = 1 << 20
+
+
+def pack_scores(middlegame: int, endgame: int) -> int:
+    return middlegame + endgame * SCORE_SHIFT
+
+
+def middlegame_score_of(packed: int) -> int:
+    return ((packed + SCORE_SHIFT // 2) & (SCORE_SHIFT - 1)) - SCORE_SHIFT // 2
+
+
+def endgame_score_of(packed: int) -> int:
+    return (packed - middlegame_score_of(packed)) // SCORE_SHIFT
+
+
+# PIECE_SQUARE_SCORES[colour][piece type][square] is the packed material + table score of the
+# piece, from white's point of view (so negative for black pieces)
+PIECE_SQUARE_SCORES: 'Dict[ColourType, Dict[str, List[int]]]' = {'white': {}, 'black': {}}
+for _piece_type, (_middlegame_table, _endgame_table) in _TABLES.items():
+    PIECE_SQUARE_SCORES['white'][_piece_type] = []
+    PIECE_SQUARE_SCORES['black'][_piece_type] = []
+    for _square in range(64):
+        _row, _col = _square >> 3, _square & 7
+        _white_index = (7 - _row) * 8 + _col
+        _black_index = _row * 8 + _col
+        PIECE_SQUARE_SCORES['white'][_piece_type].append(pack_scores(
+            MIDDLEGAME_PIECE_VALUES[_piece_type] + _middlegame_table[_white_index],
+            ENDGAME_PIECE_VALUES[_piece_type] + _endgame_table[_white_index]
+        ))
+        PIECE_SQUARE_SCORES['black'][_piece_type].append(-pack_scores(
+            MIDDLEGAME_PIECE_VALUES[_piece_type] + _middlegame_table[_black_index],
+            ENDGAME_PIECE_VALUES[_piece_type] + _endgame_table[_black_index]
+        ))
+
+
+# tapered score in centipawns from a position's packed score and phase
+def tapered_score(packed: int, phase: int) -> int:
+    phase = min(phase, MAX_PHASE)
+    return (
+        middlegame_score_of(packed) * phase + endgame_score_of(packed) * (MAX_PHASE - phase)
+    ) // MAX_PHASE
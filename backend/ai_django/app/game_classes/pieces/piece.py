@@ -1,20 +1,29 @@
 from abc import abstractmethod
 from typing import List
 
+from ..bitboards import FULL_BOARD, square_of
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from ..types import ColourType, LocType, BoardType, MoveHisType, MoveType
+    from ..types import ColourType, LocType, PositionType, PositionMoveType
 
 
 class Piece:
+    # slots instead of a per-instance __dict__ - there are 32 of these per game
+    __slots__ = (
+        'id', 'row', 'col', 'loc', 'colour', 'direction', 'legal_moves', 'pseudo_legal_moves', 'move_dependencies'
+    )
+
     def __init__(self, id: int, loc: 'LocType', colour: 'ColourType') -> None:
         self.id = id
         self.row, self.col = loc
         self.loc = loc
         self.colour: 'ColourType' = colour
         self.direction = 1 if self.colour == 'white' else -1
-        self.legal_moves: List[MoveType] = []
+        self.legal_moves: 'List[PositionMoveType]' = []
+        self.pseudo_legal_moves: 'List[PositionMoveType]' = []
+        # squares that pseudo_legal_moves depends on, see Position.move_dependencies
+        self.move_dependencies = FULL_BOARD
 
     def set_loc(self, loc: 'LocType') -> None:
         self.row, self.col = loc
@@ -32,6 +41,15 @@ class Piece:
     def __str__(self) -> str:
         pass
 
-    @abstractmethod
-    def calculate_moves(self, board: 'BoardType', move_history: 'MoveHisType', board_str: str) -> None:
-        pass
+    # sets pseudo_legal_moves (and legal_moves, until Logic filters them) to the piece's
+    # pseudo-legal moves, generated from the position's bitboards.
+    # The moves are encoded ints (see move_encoding.py), Move objects are only built for the API
+    def calculate_moves(self, position: 'PositionType') -> None:
+        square = square_of(self.loc)
+        self.pseudo_legal_moves = position.moves_from(square)
+        self.legal_moves = self.pseudo_legal_moves
+        self.move_dependencies = position.move_dependencies(square)
+
+    # whether the contents of changed_squares changing could have changed the piece's moves
+    def moves_depend_on(self, changed_squares: int) -> bool:
+        return bool(self.move_dependencies & changed_squares)
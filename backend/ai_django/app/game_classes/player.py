@@ -4,20 +4,26 @@ from .pieces.bishop import Bishop
 from .pieces.rook import Rook
 from .pieces.queen import Queen
 from .pieces.king import King
-from .constants import PIECE_TYPES
+from .bitboards import loc_of, squares_of
+from .position import CASTLING_RIGHTS
+from .constants import PIECE_TYPES, SHORT_CASTLE, LONG_CASTLE
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from .types import PieceCollection, ColourType, NonZeroDirectionType, PieceType
+    from .types import PieceCollection, ColourType, NonZeroDirectionType, PieceType, PositionType
 
 PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
+PIECE_CLASSES = {PAWNS: Pawn, KNIGHTS: Knight, BISHOPS: Bishop, ROOKS: Rook, QUEENS: Queen, KINGS: King}
 
 
 class Player:
-    def __init__(self, colour: 'ColourType') -> None:
+    __slots__ = ('colour', 'direction', 'pieces', 'num_legal_moves')
+
+    # pieces defaults to the starting pieces
+    def __init__(self, colour: 'ColourType', pieces: 'PieceCollection | None' = None) -> None:
         self.colour: 'ColourType' = colour
         self.direction: 'NonZeroDirectionType' = 1 if self.colour == 'white' else -1
-        self.pieces = self.setup_pieces()
+        self.pieces = self.setup_pieces() if pieces is None else pieces
         self.num_legal_moves = 0
 
     def setup_pieces(self) -> 'PieceCollection':
@@ -41,6 +47,29 @@ class Player:
         pieces[KINGS] = [King(0, (base_row, 4), self.colour)]
         return pieces
 
+    # colour's pieces on position. As in setup_pieces, rooks on their starting squares get
+    # ids 0 (a file) and 1 (h file) since Logic.make_move uses those ids for castling rights
+    @staticmethod
+    def from_position(colour: 'ColourType', position: 'PositionType') -> 'Player':
+        pieces: 'PieceCollection' = {piece_type: [] for piece_type in PIECE_TYPES}  # type: ignore
+        base_row = 0 if colour == 'white' else 7
+        next_ids = {piece_type: 0 for piece_type in PIECE_TYPES}
+        next_ids[ROOKS] = 2
+        for square in squares_of(position.occupied[colour]):
+            piece_type = position.mailbox[square]
+            loc = loc_of(square)
+            if piece_type == ROOKS and loc in ((base_row, 0), (base_row, 7)):
+                piece_id = loc[1] // 7
+            else:
+                piece_id = next_ids[piece_type]
+                next_ids[piece_type] += 1
+            pieces[piece_type].append(PIECE_CLASSES[piece_type](piece_id, loc, colour))
+
+        king = pieces[KINGS][0]
+        king.short_castle_rights = bool(position.castling_rights & CASTLING_RIGHTS[colour][SHORT_CASTLE])
+        king.long_castle_rights = bool(position.castling_rights & CASTLING_RIGHTS[colour][LONG_CASTLE])
+        return Player(colour, pieces)
+
     def get_piece_by_id(self, piece_type: str, piece_id: int) -> 'PieceType | None':
         for piece in self.pieces[piece_type]:
             if piece_id == piece.id:
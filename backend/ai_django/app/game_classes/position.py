@@ -0,0 +1,866 @@
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import (
+        ColourType,
+        PlayerType,
+        MoveHisType,
+        PositionMoveType
+    )
+    from .move_ordering import MoveOrdering
+
+from .bitboards import (
+    FULL_BOARD,
+    RANK_1,
+    RANK_2,
+    RANK_7,
+    RANK_8,
+    NOT_FILE_A,
+    NOT_FILE_H,
+    DARK_SQUARES,
+    square_of,
+    squares_of
+)
+from .attack_tables import (
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    PAWN_ATTACKS,
+    BETWEEN,
+    LINE,
+    bishop_attacks_from,
+    rook_attacks_from,
+    queen_attacks_from
+)
+from .zobrist import PIECE_KEYS, BLACK_TO_MOVE_KEY, CASTLING_KEYS, EN_PASSANT_FILE_KEYS
+from .piece_square_tables import PIECE_SQUARE_SCORES, PHASE_WEIGHTS, tapered_score
+from .constants import PIECE_TYPES, PIECE_VALUES
+from .constants import SHORT_CASTLE, LONG_CASTLE
+from .move_encoding import (
+    NO_FLAG,
+    NULL_MOVE,
+    SHORT_CASTLE_FLAG,
+    LONG_CASTLE_FLAG,
+    ENPASSANT_LEFT_FLAG,
+    ENPASSANT_RIGHT_FLAG,
+    PROMOTE_TO_QUEEN_FLAG,
+    PROMOTE_TO_ROOK_FLAG,
+    PROMOTE_TO_BISHOP_FLAG,
+    PROMOTE_TO_KNIGHT_FLAG
+)
+PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
+
+COLOURS: 'tuple[ColourType, ColourType]' = ('white', 'black')
+OTHER_COLOUR: 'Dict[ColourType, ColourType]' = {'white': 'black', 'black': 'white'}
+
+# attacker values for MVV-LVA ordering (see Position.mvv_lva_score), the king captures last
+ATTACKER_VALUES = {**PIECE_VALUES, KINGS: 10}
+
+# same order as Pawn.calculate_moves used to generate them in
+PROMOTION_FLAGS = (PROMOTE_TO_QUEEN_FLAG, PROMOTE_TO_ROOK_FLAG, PROMOTE_TO_BISHOP_FLAG, PROMOTE_TO_KNIGHT_FLAG)
+PROMOTION_PIECE = {
+    PROMOTE_TO_QUEEN_FLAG: QUEENS,
+    PROMOTE_TO_ROOK_FLAG: ROOKS,
+    PROMOTE_TO_BISHOP_FLAG: BISHOPS,
+    PROMOTE_TO_KNIGHT_FLAG: KNIGHTS
+}
+
+CASTLING_RIGHTS = {
+    'white': {SHORT_CASTLE: 1, LONG_CASTLE: 2},
+    'black': {SHORT_CASTLE: 4, LONG_CASTLE: 8},
+}
+
+# (move flag, castling right, king from, king to, rook from, rook to, squares that must be empty)
+# the square the king passes through is always the square the rook lands on
+CASTLES = {
+    'white': (
+        (SHORT_CASTLE_FLAG, 1, 4, 6, 7, 5, (1 << 5) | (1 << 6)),
+        (LONG_CASTLE_FLAG, 2, 4, 2, 0, 3, (1 << 1) | (1 << 2) | (1 << 3)),
+    ),
+    'black': (
+        (SHORT_CASTLE_FLAG, 4, 60, 62, 63, 61, (1 << 61) | (1 << 62)),
+        (LONG_CASTLE_FLAG, 8, 60, 58, 56, 59, (1 << 57) | (1 << 58) | (1 << 59)),
+    ),
+}
+CASTLING_ROOK_SQUARES = {
+    king_to: (rook_from, rook_to)
+    for colour in COLOURS
+    for _, _, _, king_to, rook_from, rook_to, _ in CASTLES[colour]
+}
+
+# squares whose contents decide whether colour's king can castle (other than the king's own square)
+CASTLING_DEPENDENCIES = {
+    colour: sum(must_be_empty | (1 << rook_from) for _, _, _, _, rook_from, _, must_be_empty in CASTLES[colour])
+    for colour in COLOURS
+}
+
+# castling rights that survive a move from or to each square
+CASTLING_RIGHTS_MASK = [15] * 64
+for colour in COLOURS:
+    for _, right, king_from, _, rook_from, _, _ in CASTLES[colour]:
+        CASTLING_RIGHTS_MASK[king_from] &= ~right
+        CASTLING_RIGHTS_MASK[rook_from] &= ~right
+
+
+# Bitboard representation of a position: one 64-bit int per colour and piece type,
+# plus per-colour occupancy masks and a square -> piece type mailbox for fast lookups.
+# Squares are indexed as in bitboards.py (square = row * 8 + col).
+# Moves are ints encoded as in move_encoding.py. make_move mutates the position in place and pushes an undo record,
+# so trial moves (legality checks, search) are a make_move/unmake_move pair instead of a copy.
+class Position:
+    def __init__(self) -> None:
+        self.pieces: 'Dict[ColourType, Dict[str, int]]' = {
+            colour: {piece_type: 0 for piece_type in PIECE_TYPES} for colour in COLOURS
+        }
+        self.occupied: 'Dict[ColourType, int]' = {'white': 0, 'black': 0}
+        self.mailbox: 'List[str | None]' = [None] * 64
+        self.side_to_move: 'ColourType' = 'white'
+        self.castling_rights = 0
+        self.ep_square: 'int | None' = None
+        # total PIECE_VALUES of each colour's pieces on the board
+        self.material: 'Dict[ColourType, int]' = {'white': 0, 'black': 0}
+        # sum of PIECE_SQUARE_SCORES of the pieces on the board and the game phase, for the
+        # tapered evaluation (see piece_square_tables.py)
+        self.piece_square_score = 0
+        self.phase = 0
+        # number of moves since the last pawn move or capture
+        self.halfmove_clock = 0
+        # number of moves made since the start of the game
+        self.ply = 0
+        # the ply the position was set up at, which from_fen takes from the fullmove number
+        self.start_ply = 0
+        # Zobrist key of the pieces, side to move, castling rights and en-passant file
+        self.hash = 0
+        # (move, moved piece type, captured piece type, castling rights, ep square, halfmove clock, hash),
+        # the moved piece type is None for null moves
+        self.undo_stack: 'List[Tuple[PositionMoveType, str | None, str | None, int, int | None, int, int]]' = []
+        # how many times each placement key has been reached, for 3-fold repetition
+        self.repetitions: 'Dict[int, int]' = {}
+
+    @staticmethod
+    def from_players(
+        white_player: 'PlayerType',
+        black_player: 'PlayerType',
+        move_history: 'MoveHisType'
+    ) -> 'Position':
+        position = Position()
+        for player in (white_player, black_player):
+            for piece_type in PIECE_TYPES:
+                for piece in player.pieces[piece_type]:
+                    position.put_piece(player.colour, piece_type, square_of(piece.loc))
+
+            king = player.pieces[KINGS][0]
+            if king.short_castle_rights:
+                position.castling_rights |= CASTLING_RIGHTS[player.colour][SHORT_CASTLE]
+            if king.long_castle_rights:
+                position.castling_rights |= CASTLING_RIGHTS[player.colour][LONG_CASTLE]
+
+        position.side_to_move = 'white' if len(move_history) % 2 == 0 else 'black'
+
+        if len(move_history) > 0:
+            last_move = move_history[-1]
+            if last_move.piece_type == PAWNS and abs(last_move.to_loc[0] - last_move.from_loc[0]) == 2:
+                position.ep_square = square_of(
+                    ((last_move.from_loc[0] + last_move.to_loc[0]) // 2, last_move.from_loc[1])
+                )
+
+        position.ply = len(move_history)
+        for move in reversed(move_history):
+            if move.piece_type == PAWNS or move.is_capture:
+                break
+            position.halfmove_clock += 1
+        position.hash ^= position.state_key()
+        position.repetitions[position.placement_key()] = 1
+
+        return position
+
+    # e.g. 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1'. The halfmove clock
+    # and fullmove number are optional
+    @staticmethod
+    def from_fen(fen: str) -> 'Position':
+        fields = fen.split()
+        position = Position()
+        for rank_index, rank in enumerate(fields[0].split('/')):
+            row = 7 - rank_index
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                    continue
+                position.put_piece('white' if char.isupper() else 'black', char.upper(), row * 8 + col)
+                col += 1
+
+        position.side_to_move = 'white' if fields[1] == 'w' else 'black'
+        for char, colour, castle in (
+            ('K', 'white', SHORT_CASTLE), ('Q', 'white', LONG_CASTLE),
+            ('k', 'black', SHORT_CASTLE), ('q', 'black', LONG_CASTLE)
+        ):
+            if char in fields[2]:
+                position.castling_rights |= CASTLING_RIGHTS[colour][castle]
+        if fields[3] != '-':
+            position.ep_square = (int(fields[3][1]) - 1) * 8 + ord(fields[3][0]) - ord('a')
+
+        if len(fields) > 4:
+            position.halfmove_clock = int(fields[4])
+        if len(fields) > 5:
+            position.ply = (int(fields[5]) - 1) * 2 + (position.side_to_move == 'black')
+            position.start_ply = position.ply
+        position.hash ^= position.state_key()
+        position.repetitions[position.placement_key()] = 1
+
+        return position
+
+    def to_fen(self) -> str:
+        ranks = []
+        for row in range(7, -1, -1):
+            rank = ''
+            empty_squares = 0
+            for square in range(row * 8, row * 8 + 8):
+                piece_type = self.mailbox[square]
+                if piece_type is None:
+                    empty_squares += 1
+                    continue
+                if empty_squares:
+                    rank += str(empty_squares)
+                    empty_squares = 0
+                rank += piece_type if self.occupied['white'] >> square & 1 else piece_type.lower()
+            ranks.append(rank + (str(empty_squares) if empty_squares else ''))
+
+        castling = ''.join(
+            char for char, right in zip('KQkq', (1, 2, 4, 8)) if self.castling_rights & right
+        ) or '-'
+        ep_square = '-' if self.ep_square is None else 'abcdefgh'[self.ep_square & 7] + str((self.ep_square >> 3) + 1)
+        return ' '.join((
+            '/'.join(ranks),
+            'w' if self.side_to_move == 'white' else 'b',
+            castling,
+            ep_square,
+            str(self.halfmove_clock),
+            str(self.ply // 2 + 1)
+        ))
+
+    # the part of the hash that isn't about where the pieces are
+    def state_key(self) -> int:
+        key = CASTLING_KEYS[self.castling_rights]
+        if self.side_to_move == 'black':
+            key ^= BLACK_TO_MOVE_KEY
+        if self.ep_square is not None:
+            key ^= EN_PASSANT_FILE_KEYS[self.ep_square & 7]
+        return key
+
+    # hash of the piece placement only - repetitions are detected on placement alone
+    # (ignoring side to move, castling and en-passant), same as the board strings used to be
+    def placement_key(self) -> int:
+        return self.hash ^ self.state_key()
+
+    def put_piece(self, colour: 'ColourType', piece_type: str, square: int) -> None:
+        bit = 1 << square
+        self.pieces[colour][piece_type] |= bit
+        self.occupied[colour] |= bit
+        self.mailbox[square] = piece_type
+        self.material[colour] += PIECE_VALUES[piece_type]
+        self.piece_square_score += PIECE_SQUARE_SCORES[colour][piece_type][square]
+        self.phase += PHASE_WEIGHTS[piece_type]
+        self.hash ^= PIECE_KEYS[colour][piece_type][square]
+
+    def remove_piece(self, colour: 'ColourType', piece_type: str, square: int) -> None:
+        bit = 1 << square
+        self.pieces[colour][piece_type] ^= bit
+        self.occupied[colour] ^= bit
+        self.mailbox[square] = None
+        self.material[colour] -= PIECE_VALUES[piece_type]
+        self.piece_square_score -= PIECE_SQUARE_SCORES[colour][piece_type][square]
+        self.phase -= PHASE_WEIGHTS[piece_type]
+        self.hash ^= PIECE_KEYS[colour][piece_type][square]
+
+    def move_piece(self, colour: 'ColourType', piece_type: str, from_square: int, to_square: int) -> None:
+        bits = (1 << from_square) | (1 << to_square)
+        self.pieces[colour][piece_type] ^= bits
+        self.occupied[colour] ^= bits
+        self.mailbox[from_square] = None
+        self.mailbox[to_square] = piece_type
+        scores = PIECE_SQUARE_SCORES[colour][piece_type]
+        self.piece_square_score += scores[to_square] - scores[from_square]
+        piece_keys = PIECE_KEYS[colour][piece_type]
+        self.hash ^= piece_keys[from_square] ^ piece_keys[to_square]
+
+    # tapered piece-square evaluation in centipawns, from white's point of view
+    def piece_square_evaluation(self) -> int:
+        return tapered_score(self.piece_square_score, self.phase)
+
+    def colour_at(self, square: int) -> 'ColourType | None':
+        if self.occupied['white'] >> square & 1:
+            return 'white'
+        if self.occupied['black'] >> square & 1:
+            return 'black'
+        return None
+
+    def all_occupied(self) -> int:
+        return self.occupied['white'] | self.occupied['black']
+
+    def attacks_from(self, piece_type: str, colour: 'ColourType', square: int) -> int:
+        if piece_type == PAWNS:
+            return PAWN_ATTACKS[colour][square]
+        if piece_type == KNIGHTS:
+            return KNIGHT_ATTACKS[square]
+        if piece_type == BISHOPS:
+            return bishop_attacks_from(square, self.all_occupied())
+        if piece_type == ROOKS:
+            return rook_attacks_from(square, self.all_occupied())
+        if piece_type == QUEENS:
+            return queen_attacks_from(square, self.all_occupied())
+        return KING_ATTACKS[square]
+
+    # works outward from square: a piece of by_colour attacks it iff that piece stands on a square
+    # the same kind of piece on square would attack. occupied defaults to the current occupancy
+    def is_square_attacked(self, square: int, by_colour: 'ColourType', occupied: 'int | None' = None) -> bool:
+        pieces = self.pieces[by_colour]
+        if KNIGHT_ATTACKS[square] & pieces[KNIGHTS]:
+            return True
+        if KING_ATTACKS[square] & pieces[KINGS]:
+            return True
+        if PAWN_ATTACKS[OTHER_COLOUR[by_colour]][square] & pieces[PAWNS]:
+            return True
+        if occupied is None:
+            occupied = self.all_occupied()
+        queens = pieces[QUEENS]
+        if bishop_attacks_from(square, occupied) & (pieces[BISHOPS] | queens):
+            return True
+        return bool(rook_attacks_from(square, occupied) & (pieces[ROOKS] | queens))
+
+    # bitboard of by_colour's pieces that attack square
+    def attackers_of(self, square: int, by_colour: 'ColourType', occupied: 'int | None' = None) -> int:
+        pieces = self.pieces[by_colour]
+        if occupied is None:
+            occupied = self.all_occupied()
+        queens = pieces[QUEENS]
+        return (
+            (KNIGHT_ATTACKS[square] & pieces[KNIGHTS])
+            | (KING_ATTACKS[square] & pieces[KINGS])
+            | (PAWN_ATTACKS[OTHER_COLOUR[by_colour]][square] & pieces[PAWNS])
+            | (bishop_attacks_from(square, occupied) & (pieces[BISHOPS] | queens))
+            | (rook_attacks_from(square, occupied) & (pieces[ROOKS] | queens))
+        )
+
+    def in_check(self, colour: 'ColourType') -> bool:
+        king_square = self.pieces[colour][KINGS].bit_length() - 1
+        return self.is_square_attacked(king_square, OTHER_COLOUR[colour])
+
+    # whether the king of colour could stand on square, i.e. square isn't attacked once the
+    # king has left its current square (so sliders see through it)
+    def is_king_move_safe(self, colour: 'ColourType', square: int) -> bool:
+        occupied = self.all_occupied() ^ self.pieces[colour][KINGS]
+        return not self.is_square_attacked(square, OTHER_COLOUR[colour], occupied)
+
+    # pseudo-legal moves (i.e. the king may be left in check) of the piece on square,
+    # only to squares in target_mask (en-passant is left to pawn_moves)
+    def moves_from(self, square: int, target_mask: int = FULL_BOARD) -> 'List[PositionMoveType]':
+        piece_type = self.mailbox[square]
+        colour = self.colour_at(square)
+        if piece_type is None or colour is None:
+            return []
+        if piece_type == PAWNS:
+            return self.pawn_moves(square, colour, target_mask)
+
+        targets = self.attacks_from(piece_type, colour, square) & ~self.occupied[colour] & target_mask
+        moves: 'List[PositionMoveType]' = [square | to_square << 6 for to_square in squares_of(targets)]
+        if piece_type == KINGS:
+            moves.extend(self.castling_moves(colour))
+        return moves
+
+    # the squares whose contents moves_from(square) depends on, including square itself. For pawns
+    # this covers the squares they could capture en-passant on, i.e. those that need checking
+    # whenever the en-passant square changes
+    def move_dependencies(self, square: int) -> int:
+        piece_type = self.mailbox[square]
+        colour = self.colour_at(square)
+        if piece_type is None or colour is None:
+            return 1 << square
+        dependencies = (1 << square) | self.attacks_from(piece_type, colour, square)
+        if piece_type == PAWNS:
+            if colour == 'white':
+                one_up, two_up, starting_rank = square + 8, square + 16, RANK_2
+            else:
+                one_up, two_up, starting_rank = square - 8, square - 16, RANK_7
+            dependencies |= 1 << one_up
+            if (1 << square) & starting_rank:
+                dependencies |= 1 << two_up
+        elif piece_type == KINGS:
+            dependencies |= CASTLING_DEPENDENCIES[colour]
+        return dependencies & FULL_BOARD
+
+    def pawn_moves(
+        self,
+        square: int,
+        colour: 'ColourType',
+        target_mask: int = FULL_BOARD,
+        en_passant: bool = True
+    ) -> 'List[PositionMoveType]':
+        bit = 1 << square
+        empty = FULL_BOARD ^ self.all_occupied()
+        if colour == 'white':
+            one_up, two_up, starting_rank, last_rank = square + 8, square + 16, RANK_2, RANK_8
+        else:
+            one_up, two_up, starting_rank, last_rank = square - 8, square - 16, RANK_7, RANK_1
+
+        targets = 0
+        if empty >> one_up & 1:
+            targets |= 1 << one_up
+            if bit & starting_rank and empty >> two_up & 1:
+                targets |= 1 << two_up
+        attacks = PAWN_ATTACKS[colour][square]
+        targets |= attacks & self.occupied[OTHER_COLOUR[colour]]
+        targets &= target_mask
+
+        moves: 'List[PositionMoveType]' = []
+        for to_square in squares_of(targets):
+            if (1 << to_square) & last_rank:
+                move = square | to_square << 6
+                moves.extend(move | flag << 12 for flag in PROMOTION_FLAGS)
+            else:
+                moves.append(square | to_square << 6)
+
+        ep_square = self.ep_square
+        if en_passant and ep_square is not None and colour == self.side_to_move and attacks >> ep_square & 1:
+            flag = ENPASSANT_LEFT_FLAG if (ep_square & 7) < (square & 7) else ENPASSANT_RIGHT_FLAG
+            moves.append(square | ep_square << 6 | flag << 12)
+
+        return moves
+
+    # castling moves allowed by the castling rights and empty squares (not checked for attacks)
+    def castling_moves(self, colour: 'ColourType') -> 'List[PositionMoveType]':
+        occupied = self.all_occupied()
+        return [
+            king_from | king_to << 6 | flag << 12
+            for flag, right, king_from, king_to, _, _, must_be_empty in CASTLES[colour]
+            if self.castling_rights & right and not occupied & must_be_empty
+        ]
+
+    def pseudo_legal_moves(self, colour: 'ColourType') -> 'List[PositionMoveType]':
+        moves: 'List[PositionMoveType]' = []
+        for square in squares_of(self.occupied[colour]):
+            moves.extend(self.moves_from(square))
+        return moves
+
+    def make_move(self, move: 'PositionMoveType') -> None:
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        flag = move >> 12
+        colour = self.side_to_move
+        opponent_colour = OTHER_COLOUR[colour]
+        piece_type = self.mailbox[from_square]
+        captured_type = self.mailbox[to_square]
+        assert piece_type is not None
+
+        self.undo_stack.append(
+            (move, piece_type, captured_type, self.castling_rights, self.ep_square, self.halfmove_clock, self.hash)
+        )
+        self.hash ^= self.state_key()
+
+        if captured_type is not None:
+            self.remove_piece(opponent_colour, captured_type, to_square)
+        self.move_piece(colour, piece_type, from_square, to_square)
+
+        self.ep_square = None
+        if flag == NO_FLAG:
+            if piece_type == PAWNS and abs(to_square - from_square) == 16:
+                self.ep_square = (from_square + to_square) >> 1
+        elif flag == ENPASSANT_LEFT_FLAG or flag == ENPASSANT_RIGHT_FLAG:
+            captured_square = to_square - 8 if colour == 'white' else to_square + 8
+            self.remove_piece(opponent_colour, PAWNS, captured_square)
+            captured_type = PAWNS
+        elif flag == SHORT_CASTLE_FLAG or flag == LONG_CASTLE_FLAG:
+            rook_from, rook_to = CASTLING_ROOK_SQUARES[to_square]
+            self.move_piece(colour, ROOKS, rook_from, rook_to)
+        else:
+            self.remove_piece(colour, PAWNS, to_square)
+            self.put_piece(colour, PROMOTION_PIECE[flag], to_square)
+
+        self.castling_rights &= CASTLING_RIGHTS_MASK[from_square] & CASTLING_RIGHTS_MASK[to_square]
+        self.side_to_move = opponent_colour
+        self.hash ^= self.state_key()
+
+        if piece_type == PAWNS or captured_type is not None:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        self.ply += 1
+        key = self.placement_key()
+        self.repetitions[key] = self.repetitions.get(key, 0) + 1
+
+    def unmake_move(self) -> None:
+        key = self.placement_key()
+        if self.repetitions[key] == 1:
+            del self.repetitions[key]
+        else:
+            self.repetitions[key] -= 1
+
+        (
+            move, piece_type, captured_type, castling_rights, ep_square, halfmove_clock, hash_before_move
+        ) = self.undo_stack.pop()
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        flag = move >> 12
+        opponent_colour = self.side_to_move
+        colour = OTHER_COLOUR[opponent_colour]
+
+        if flag == NO_FLAG:
+            self.move_piece(colour, piece_type, to_square, from_square)
+        elif flag == ENPASSANT_LEFT_FLAG or flag == ENPASSANT_RIGHT_FLAG:
+            self.move_piece(colour, PAWNS, to_square, from_square)
+            self.put_piece(opponent_colour, PAWNS, to_square - 8 if colour == 'white' else to_square + 8)
+        elif flag == SHORT_CASTLE_FLAG or flag == LONG_CASTLE_FLAG:
+            rook_from, rook_to = CASTLING_ROOK_SQUARES[to_square]
+            self.move_piece(colour, ROOKS, rook_to, rook_from)
+            self.move_piece(colour, KINGS, to_square, from_square)
+        else:
+            self.remove_piece(colour, PROMOTION_PIECE[flag], to_square)
+            self.put_piece(colour, PAWNS, from_square)
+
+        if captured_type is not None:
+            self.put_piece(opponent_colour, captured_type, to_square)
+
+        self.side_to_move = colour
+        self.castling_rights = castling_rights
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.ply -= 1
+        self.hash = hash_before_move
+
+    # Passes the turn to the other side, for null-move pruning in the search. Only the side to move
+    # and the en-passant square change: it isn't a real move, so it isn't counted for repetitions
+    # or the move clocks. Undone with unmake_null_move
+    def make_null_move(self) -> None:
+        self.undo_stack.append(
+            (NULL_MOVE, None, None, self.castling_rights, self.ep_square, self.halfmove_clock, self.hash)
+        )
+        self.hash ^= self.state_key()
+        self.ep_square = None
+        self.side_to_move = OTHER_COLOUR[self.side_to_move]
+        self.hash ^= self.state_key()
+
+    def unmake_null_move(self) -> None:
+        _, _, _, _, ep_square, _, hash_before_move = self.undo_stack.pop()
+        self.side_to_move = OTHER_COLOUR[self.side_to_move]
+        self.ep_square = ep_square
+        self.hash = hash_before_move
+
+    # unmakes the last move, real or null
+    def unmake_any_move(self) -> None:
+        if self.undo_stack[-1][0] == NULL_MOVE:
+            self.unmake_null_move()
+        else:
+            self.unmake_move()
+
+    # whether colour has any pieces other than pawns and the king
+    def has_non_pawn_material(self, colour: 'ColourType') -> bool:
+        pieces = self.pieces[colour]
+        return (pieces[KNIGHTS] | pieces[BISHOPS] | pieces[ROOKS] | pieces[QUEENS]) != 0
+
+    # own pieces of colour that stand alone between their king and an enemy slider
+    def pinned_pieces(self, colour: 'ColourType', king_square: int) -> int:
+        opponent_pieces = self.pieces[OTHER_COLOUR[colour]]
+        opponent_occupied = self.occupied[OTHER_COLOUR[colour]]
+        # sliders that would attack the king if only the opponent's pieces were on the board
+        snipers = (
+            (rook_attacks_from(king_square, opponent_occupied) & (opponent_pieces[ROOKS] | opponent_pieces[QUEENS]))
+            | (
+                bishop_attacks_from(king_square, opponent_occupied)
+                & (opponent_pieces[BISHOPS] | opponent_pieces[QUEENS])
+            )
+        )
+        occupied = self.all_occupied()
+        pinned = 0
+        for sniper_square in squares_of(snipers):
+            blockers = BETWEEN[king_square][sniper_square] & occupied
+            if blockers and not blockers & (blockers - 1):
+                pinned |= blockers & self.occupied[colour]
+        return pinned
+
+    # en-passant removes two pieces from the capturing side's rank, so instead of the pin rules it
+    # checks the king directly with the occupancy after the capture
+    def is_legal_en_passant(self, from_square: int, king_square: int) -> bool:
+        colour = self.side_to_move
+        opponent_pieces = self.pieces[OTHER_COLOUR[colour]]
+        ep_square = self.ep_square
+        assert ep_square is not None
+        captured = 1 << (ep_square - 8 if colour == 'white' else ep_square + 8)
+        occupied = self.all_occupied() ^ (1 << from_square) ^ captured ^ (1 << ep_square)
+        queens = opponent_pieces[QUEENS]
+        return not (
+            (KNIGHT_ATTACKS[king_square] & opponent_pieces[KNIGHTS])
+            | (PAWN_ATTACKS[colour][king_square] & opponent_pieces[PAWNS] & ~captured)
+            | (bishop_attacks_from(king_square, occupied) & (opponent_pieces[BISHOPS] | queens))
+            | (rook_attacks_from(king_square, occupied) & (opponent_pieces[ROOKS] | queens))
+        )
+
+    # Legal moves of the side to move, generated without making any trial moves:
+    # - the king may go to any square that isn't attacked once it has left its current square
+    # - in double check only the king can move
+    # - in single check other pieces must capture the checker or block on the squares between
+    # - a pinned piece can only move along the line through its king and itself
+    # Moves come out in the same order as pseudo_legal_moves (by square, then piece moves)
+    # Only generates moves of the pieces on from_mask. captures=False leaves out captures
+    # (including en-passant) and promotions, quiets=False leaves out every other move.
+    # With first_piece_only, stops after the first piece that has a legal move (see has_legal_move)
+    def generate_legal_moves(
+        self,
+        first_piece_only: bool = False,
+        from_mask: int = FULL_BOARD,
+        captures: bool = True,
+        quiets: bool = True
+    ) -> 'List[PositionMoveType]':
+        colour = self.side_to_move
+        opponent_colour = OTHER_COLOUR[colour]
+        king_square = self.pieces[colour][KINGS].bit_length() - 1
+        checkers = self.attackers_of(king_square, opponent_colour)
+        pinned = self.pinned_pieces(colour, king_square)
+
+        if checkers:
+            checker_square = checkers.bit_length() - 1
+            target_mask = checkers | BETWEEN[king_square][checker_square]
+        else:
+            target_mask = FULL_BOARD
+        double_check = checkers & (checkers - 1)
+
+        stage_mask = pawn_stage_mask = FULL_BOARD
+        if not (captures and quiets):
+            capture_squares = self.occupied[opponent_colour]
+            promotion_or_capture_squares = capture_squares | (RANK_8 if colour == 'white' else RANK_1)
+            stage_mask = capture_squares if captures else FULL_BOARD ^ capture_squares
+            pawn_stage_mask = (
+                promotion_or_capture_squares if captures else FULL_BOARD ^ promotion_or_capture_squares
+            )
+
+        ep_square = self.ep_square if captures else None
+        moves: 'List[PositionMoveType]' = []
+        for square in squares_of(self.occupied[colour] & from_mask):
+            if square == king_square:
+                occupied = self.all_occupied() ^ (1 << king_square)
+                targets = KING_ATTACKS[king_square] & ~self.occupied[colour] & stage_mask
+                for to_square in squares_of(targets):
+                    if not self.is_square_attacked(to_square, opponent_colour, occupied):
+                        moves.append(square | to_square << 6)
+                if not checkers and quiets:
+                    for move in self.castling_moves(colour):
+                        to_square = move >> 6 & 63
+                        if (
+                            not self.is_square_attacked((square + to_square) >> 1, opponent_colour)
+                            and self.is_king_move_safe(colour, to_square)
+                        ):
+                            moves.append(move)
+                if first_piece_only and moves:
+                    return moves
+                continue
+            if double_check:
+                continue
+
+            mask = target_mask
+            if pinned >> square & 1:
+                mask &= LINE[king_square][square]
+            if self.mailbox[square] != PAWNS:
+                moves.extend(self.moves_from(square, mask & stage_mask))
+                if first_piece_only and moves:
+                    return moves
+                continue
+
+            moves.extend(self.pawn_moves(square, colour, mask & pawn_stage_mask, en_passant=False))
+            if (
+                ep_square is not None
+                and PAWN_ATTACKS[colour][square] >> ep_square & 1
+                and self.is_legal_en_passant(square, king_square)
+            ):
+                flag = ENPASSANT_LEFT_FLAG if (ep_square & 7) < (square & 7) else ENPASSANT_RIGHT_FLAG
+                moves.append(square | ep_square << 6 | flag << 12)
+            if first_piece_only and moves:
+                return moves
+
+        return moves
+
+    def is_legal_move(self, move: 'PositionMoveType') -> bool:
+        return move in self.generate_legal_moves(from_mask=1 << (move & 63))
+
+    # Yields the side to move's legal moves in stages: hash_move (if it's legal here), then captures
+    # and promotions, then the rest. A stage's moves are only generated once the previous stage has
+    # been used up, so a search that stops early never generates the later ones. The position
+    # has to be back at the same state whenever the next move is asked for.
+    # With move_ordering, captures are tried in MVV-LVA order, then the killer moves for search_ply
+    # (if they're legal here), then the rest of the quiet moves by their history score
+    def staged_legal_moves(
+        self,
+        hash_move: 'PositionMoveType | None' = None,
+        move_ordering: 'MoveOrdering | None' = None,
+        search_ply: int = 0
+    ) -> 'Iterator[PositionMoveType]':
+        if hash_move is not None:
+            if self.is_legal_move(hash_move):
+                yield hash_move
+            else:
+                hash_move = None
+
+        captures = self.generate_legal_moves(quiets=False)
+        if move_ordering is not None:
+            captures.sort(key=self.mvv_lva_score, reverse=True)
+        for move in captures:
+            if move != hash_move:
+                yield move
+
+        tried = [hash_move]
+        if move_ordering is not None and search_ply < len(move_ordering.killers):
+            for killer in move_ordering.killers[search_ply]:
+                if killer is not None and killer not in tried and self.is_quiet(killer) and self.is_legal_move(killer):
+                    yield killer
+                    tried.append(killer)
+
+        quiets = self.generate_legal_moves(captures=False)
+        if move_ordering is not None:
+            history = move_ordering.history[self.side_to_move]
+            quiets.sort(key=lambda move: history[move & 4095], reverse=True)
+        for move in quiets:
+            if move not in tried:
+                yield move
+
+    # whether the move is neither a capture nor a promotion, i.e. it's in the last stage of
+    # staged_legal_moves
+    def is_quiet(self, move: 'PositionMoveType') -> bool:
+        return self.mailbox[move >> 6 & 63] is None and move >> 12 <= LONG_CASTLE_FLAG
+
+    # material the side to move wins with the move, in PIECE_VALUES
+    def material_gain(self, move: 'PositionMoveType') -> int:
+        flag = move >> 12
+        victim = self.mailbox[move >> 6 & 63]
+        gain = 0 if victim is None else PIECE_VALUES[victim]
+        if flag == ENPASSANT_LEFT_FLAG or flag == ENPASSANT_RIGHT_FLAG:
+            gain = PIECE_VALUES[PAWNS]
+        elif flag >= PROMOTE_TO_QUEEN_FLAG:
+            gain += PIECE_VALUES[PROMOTION_PIECE[flag]] - PIECE_VALUES[PAWNS]
+        return gain
+
+    # Most valuable victim, then least valuable attacker. Promotions score as capturing the piece
+    # they promote to
+    def mvv_lva_score(self, move: 'PositionMoveType') -> int:
+        flag = move >> 12
+        victim = self.mailbox[move >> 6 & 63]
+        score = 0 if victim is None else PIECE_VALUES[victim] * 16
+        if flag == ENPASSANT_LEFT_FLAG or flag == ENPASSANT_RIGHT_FLAG:
+            score = PIECE_VALUES[PAWNS] * 16
+        elif flag >= PROMOTE_TO_QUEEN_FLAG:
+            score += PIECE_VALUES[PROMOTION_PIECE[flag]] * 16
+        return score - ATTACKER_VALUES[self.mailbox[move & 63]]
+
+    def has_legal_move(self) -> bool:
+        return len(self.generate_legal_moves(first_piece_only=True)) > 0
+
+    # Number of pseudo-legal moves colour would have if it were their turn, counted from attack
+    # sets without checking legality. Promotions count once and castling isn't counted.
+    # This is a lot cheaper than len(legal_moves(colour)) and is used as the mobility term
+    # instead of it in one-sided search or with settings.mobility == 'attacks'
+    def mobility(self, colour: 'ColourType') -> int:
+        pieces = self.pieces[colour]
+        not_own = FULL_BOARD ^ self.occupied[colour]
+        enemies = self.occupied[OTHER_COLOUR[colour]]
+        occupied = self.occupied[colour] | enemies
+        empty = FULL_BOARD ^ occupied
+
+        count = 0
+        for square in squares_of(pieces[KNIGHTS]):
+            count += (KNIGHT_ATTACKS[square] & not_own).bit_count()
+        for square in squares_of(pieces[BISHOPS]):
+            count += (bishop_attacks_from(square, occupied) & not_own).bit_count()
+        for square in squares_of(pieces[ROOKS]):
+            count += (rook_attacks_from(square, occupied) & not_own).bit_count()
+        for square in squares_of(pieces[QUEENS]):
+            count += (queen_attacks_from(square, occupied) & not_own).bit_count()
+        for square in squares_of(pieces[KINGS]):
+            count += (KING_ATTACKS[square] & not_own).bit_count()
+
+        pawns = pieces[PAWNS]
+        if colour == 'white':
+            one_up = (pawns << 8) & empty
+            two_up = ((one_up & (RANK_2 << 8)) << 8) & empty
+            left_captures = (pawns << 7) & NOT_FILE_H & enemies
+            right_captures = (pawns << 9) & NOT_FILE_A & enemies
+        else:
+            one_up = (pawns >> 8) & empty
+            two_up = ((one_up & (RANK_7 >> 8)) >> 8) & empty
+            left_captures = (pawns >> 9) & NOT_FILE_H & enemies
+            right_captures = (pawns >> 7) & NOT_FILE_A & enemies
+        return (
+            count + one_up.bit_count() + two_up.bit_count() + left_captures.bit_count() + right_captures.bit_count()
+        )
+
+    # legal moves of colour (default: the side to move). Moves of the side not to move are
+    # generated as if it were their turn, without en-passant
+    def legal_moves(self, colour: 'ColourType | None' = None) -> 'List[PositionMoveType]':
+        if colour is None or colour == self.side_to_move:
+            return self.generate_legal_moves()
+
+        side_to_move, ep_square = self.side_to_move, self.ep_square
+        self.side_to_move, self.ep_square = colour, None
+        moves = self.generate_legal_moves()
+        self.side_to_move, self.ep_square = side_to_move, ep_square
+        return moves
+
+    # number of move sequences depth moves long from this position, for checking the move
+    # generator against known counts (see perft.py)
+    def perft(self, depth: int) -> int:
+        if depth == 0:
+            return 1
+        moves = self.generate_legal_moves()
+        if depth == 1:
+            return len(moves)
+        nodes = 0
+        for move in moves:
+            self.make_move(move)
+            nodes += self.perft(depth - 1)
+            self.unmake_move()
+        return nodes
+
+    # perft split by the first move, to find which move a wrong count comes from
+    def divide(self, depth: int) -> 'Dict[PositionMoveType, int]':
+        counts: 'Dict[PositionMoveType, int]' = {}
+        for move in self.generate_legal_moves():
+            self.make_move(move)
+            counts[move] = self.perft(depth - 1)
+            self.unmake_move()
+        return counts
+
+    # using lichess / FIDE rules, i.e. it's only a draw if there's absolutely no mate possible
+    # (it's not a draw if there is a possible mate even if there is no forced mate)
+    def insufficient_mating_material(self) -> bool:
+        for colour in COLOURS:
+            pieces = self.pieces[colour]
+            other_pieces = self.pieces[OTHER_COLOUR[colour]]
+            if pieces[PAWNS] or pieces[ROOKS] or pieces[QUEENS] or pieces[KNIGHTS].bit_count() >= 2:
+                return False
+            if pieces[KNIGHTS] and (pieces[BISHOPS] or other_pieces[KNIGHTS] or other_pieces[BISHOPS]):
+                return False
+            bishops = pieces[BISHOPS]
+            if bishops and other_pieces[BISHOPS]:
+                bishops |= other_pieces[BISHOPS]
+            if bishops & DARK_SQUARES and bishops & ~DARK_SQUARES:
+                return False
+        return True
+
+    # checks stalemate, insufficient mating material, 3-fold repetition and the 50-move rule
+    # for the side to move, in constant time apart from the stalemate move count
+    def is_draw(self, in_check: bool, num_legal_moves: int) -> 'Tuple[bool, str | None]':
+        if not in_check and num_legal_moves == 0:
+            return (True, 'stalemate')
+
+        if self.insufficient_mating_material():
+            return (True, 'insufficient material')
+
+        # a placement from before a pawn move or capture can't come back, so counting every
+        # position in the game is the same as counting since the last irreversible move
+        if self.repetitions[self.placement_key()] >= 3:
+            return (True, '3-fold repetition')
+
+        # Same result as the move history walk this replaced: it looked back at most 99 moves and
+        # only called a draw if it didn't reach a pawn move or capture in that time, and had
+        # seen at least 50 moves (which can only happen short of 99 moves at the start of the history,
+        # i.e. when every move played since the position was set up is counted by the clock)
+        if self.halfmove_clock >= 99 or (
+            self.halfmove_clock >= 50 and self.halfmove_clock == self.ply - self.start_ply
+        ):
+            return (True, '50-move rule')
+        return (False, None)
@@ -1,8 +1,121 @@
 def init():
-    global debug
+    global debug, incremental_moves, one_sided_search, evaluator, mobility, transposition_table_mb, \
+        ordering_heuristics, quiescence, quiescence_max_ply, null_move_pruning, \
+        late_move_reductions, futility_pruning, razoring, principal_variation_search, aspiration_windows, \
+        tree_free_search
     debug = False
+    # only regenerate the moves of pieces affected by the last move (see Logic.make_move),
+    # turn off to regenerate every piece's moves after every move
+    incremental_moves = True
+    # search nodes only generate the side to move's legal moves, when they're needed, and get
+    # everything else from attack queries (see ChessAI.get_game_state). The Game always
+    # generates both sides' moves for the API
+    one_sided_search = False
+    # 'material' (material and mobility) or 'piece_square' (tapered piece-square tables),
+    # see ChessAI.evaluate_position
+    evaluator = 'material'
+    # the 'material' evaluator's mobility term: 'legal' (number of legal moves) or 'attacks'
+    # (Position.mobility, which one-sided search always uses)
+    mobility = 'legal'
+    # size of the search's transposition table in MB (see transposition_table.py), 0 turns it off
+    transposition_table_mb = 16
+    # order the search's moves with MVV-LVA, killer moves and the history table (see
+    # move_ordering.py), turn off to try captures and quiet moves in the order they're generated
+    ordering_heuristics = True
+    # carry on searching captures and promotions past the search depth, up to quiescence_max_ply
+    # more moves, so leaves aren't evaluated in the middle of an exchange (see ChessAI.quiescence)
+    quiescence = True
+    quiescence_max_ply = 8
+    # selective search, see NULL_MOVE_REDUCTION in ai.py. Off by default since it can change the
+    # move the search finds, and so the moves play-best-move plays
+    null_move_pruning = False
+    late_move_reductions = False
+    futility_pruning = False
+    razoring = False
+    # search moves after the first with a null window first (see ChessAI.negamax), and search each
+    # iterative deepening depth with a window around the last one's score (see ASPIRATION_WINDOW)
+    principal_variation_search = True
+    aspiration_windows = True
+    # only keep the root's children and the principal variation from a search instead of every
+    # node it visits (see ChessAI.negamax)
+    tree_free_search = True
 
 
 def set_debug(new_value):
     global debug
     debug = new_value
+
+
+def set_incremental_moves(new_value):
+    global incremental_moves
+    incremental_moves = new_value
+
+
+def set_one_sided_search(new_value):
+    global one_sided_search
+    one_sided_search = new_value
+
+
+def set_evaluator(new_value):
+    global evaluator
+    evaluator = new_value
+
+
+def set_mobility(new_value):
+    global mobility
+    mobility = new_value
+
+
+def set_transposition_table_mb(new_value):
+    global transposition_table_mb
+    transposition_table_mb = new_value
+
+
+def set_ordering_heuristics(new_value):
+    global ordering_heuristics
+    ordering_heuristics = new_value
+
+
+def set_quiescence(new_value):
+    global quiescence
+    quiescence = new_value
+
+
+def set_quiescence_max_ply(new_value):
+    global quiescence_max_ply
+    quiescence_max_ply = new_value
+
+
+def set_null_move_pruning(new_value):
+    global null_move_pruning
+    null_move_pruning = new_value
+
+
+def set_late_move_reductions(new_value):
+    global late_move_reductions
+    late_move_reductions = new_value
+
+
+def set_futility_pruning(new_value):
+    global futility_pruning
+    futility_pruning = new_value
+
+
+def set_razoring(new_value):
+    global razoring
+    razoring = new_value
+
+
+def set_principal_variation_search(new_value):
+    global principal_variation_search
+    principal_variation_search = new_value
+
+
+def set_aspiration_windows(new_value):
+    global aspiration_windows
+    aspiration_windows = new_value
+
+
+def set_tree_free_search(new_value):
+    global tree_free_search
+    tree_free_search = new_value
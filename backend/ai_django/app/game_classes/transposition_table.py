@@ -0,0 +1,56 @@
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import PositionMoveType, TranspositionEntryType
+
+# What an entry's score says about the real score of the position: the score itself, or (when the
+# search cut off or no move beat alpha) a lower or upper bound on it
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Roughly how much memory an entry takes: the tuple, its hash and score, the move and the list
+# slot pointing at it. Only used to turn a size in MB into a number of buckets
+ENTRY_BYTES = 180
+
+
+# Fixed-size table of search results keyed by Position.hash, so positions reached through
+# different move orders (or in an earlier search) aren't searched again from scratch. Each
+# bucket has two slots: the first keeps the deepest result stored for the bucket and the second
+# always takes the newest result that isn't deep enough for the first
+class TranspositionTable:
+    def __init__(self, size_mb: float) -> None:
+        self.size_mb = size_mb
+        self.num_buckets = max(1, int(size_mb * 2 ** 20) // (2 * ENTRY_BYTES))
+        self.slots: 'List[TranspositionEntryType | None]' = [None] * (2 * self.num_buckets)
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> 'TranspositionEntryType | None':
+        self.probes += 1
+        index = key % self.num_buckets * 2
+        for entry in (self.slots[index], self.slots[index + 1]):
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: float, best_move: 'PositionMoveType | None') -> None:
+        index = key % self.num_buckets * 2
+        deepest = self.slots[index]
+        if deepest is None or deepest[0] == key or depth >= deepest[1]:
+            self.slots[index] = (key, depth, bound, score, best_move)
+        else:
+            self.slots[index + 1] = (key, depth, bound, score, best_move)
+
+    def clear(self) -> None:
+        self.slots = [None] * (2 * self.num_buckets)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.probes = 0
+        self.hits = 0
+
+    # fraction of probes since the last reset_stats that found an entry for the position
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
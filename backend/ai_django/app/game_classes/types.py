@@ -10,6 +10,7 @@ from .player import Player
 from .move import Move
 from .ai import TreeNode, GameState
 from .game_status import GameStatus
+from .position import Position
 from typing import TypedDict
 
 
@@ -26,6 +27,10 @@ MoveType = Move
 TreeNodeType = TreeNode
 GameStatusType = GameStatus
 GameStateType = GameState
+PositionType = Position
+PositionMoveType = int  # encoded as in move_encoding.py
+# (hash, depth, bound, score, best move), see transposition_table.py
+TranspositionEntryType = Tuple[int, int, int, float, PositionMoveType | None]
 
 
 class PieceCollection(TypedDict):
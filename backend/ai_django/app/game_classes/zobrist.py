@@ -0,0 +1,21 @@
+import random
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import ColourType
+
+from .constants import PIECE_TYPES
+
+# Random 64-bit keys for Zobrist hashing. A position's hash is the xor of the key of every
+# (colour, piece type, square) on the board, plus the keys for the side to move, castling rights
+# and en-passant file, so making a move only has to xor in and out what changed.
+# The generator is seeded so hashes are the same in every process (e.g. for multiprocessing).
+_rng = random.Random(0x5EED_C4E55)
+
+PIECE_KEYS: 'Dict[ColourType, Dict[str, List[int]]]' = {
+    colour: {piece_type: [_rng.getrandbits(64) for _ in range(64)] for piece_type in PIECE_TYPES}
+    for colour in ('white', 'black')
+}
+BLACK_TO_MOVE_KEY = _rng.getrandbits(64)
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(16)]  # indexed by Position.castling_rights
+EN_PASSANT_FILE_KEYS = [_rng.getrandbits(64) for _ in range(8)]
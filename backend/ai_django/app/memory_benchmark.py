@@ -0,0 +1,65 @@
+# Reports the peak memory (resident set size) of searching the search_benchmark.py positions with
+# Game.update_move_tree at depths 2, 3 and 4, keeping the whole search tree and with
+# settings.tree_free_search, and how much of it the search added to the memory used before it
+# started. Peak RSS is for the whole process, so every depth and mode runs in a process of its own.
+# Linux only (resource reports kilobytes there).
+#
+# python memory_benchmark.py
+# python memory_benchmark.py --depths 2 3 4 5
+
+import argparse
+import resource
+import subprocess
+import sys
+from timeit import default_timer as timer
+from game_classes.game import Game
+from game_classes import settings
+from search_benchmark import POSITIONS
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# searches every position in this process and prints the peak RSS before and after, and the time
+def measure(depth: int, tree_free_search: bool):
+    settings.init()
+    settings.set_tree_free_search(tree_free_search)
+    games = [Game.from_fen(fen) for _, fen in POSITIONS]
+    for game in games:
+        game.calculate_legal_moves()
+    rss_before = peak_rss_mb()
+    start = timer()
+    for game in games:
+        # the game keeps its move tree after playing the move, as it would between requests
+        game.update_move_tree(depth)
+        game.play_best_move()
+    print(rss_before, peak_rss_mb(), timer() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depths', type=int, nargs='+', default=[2, 3, 4])
+    parser.add_argument('--measure', type=int, nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure is not None:
+        measure(args.measure[0], bool(args.measure[1]))
+        return
+
+    print(f'{"":<8} {"whole tree":>37} | {"tree-free":>37}')
+    for depth in args.depths:
+        line = f'depth {depth:<2}'
+        for tree_free_search in (False, True):
+            output = subprocess.run(
+                [sys.executable, __file__, '--measure', str(depth), str(int(tree_free_search))],
+                capture_output=True, text=True, check=True
+            ).stdout
+            rss_before, rss_after, elapsed = (float(value) for value in output.split())
+            line += f' {rss_after:>7.1f} MB peak {rss_after - rss_before:>+7.1f} MB {elapsed:>7.2f}s'
+            if not tree_free_search:
+                line += ' |'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
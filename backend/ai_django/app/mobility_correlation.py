@@ -0,0 +1,102 @@
+# Compares the evaluation's mobility term worked out from legal move counts with the estimate
+# from attack sets (Position.mobility): how well they correlate and how long each takes.
+# Positions are sampled from the lichess games used by test_via_pgn.py, or from random games
+# if that file isn't there.
+#
+# python mobility_correlation.py [number of games]
+
+import os
+import random
+import re
+import sys
+from statistics import correlation
+from timeit import default_timer as timer
+from game_classes.game import Game
+from game_classes import settings
+from game_classes.bitboards import loc_of
+from game_classes.move_encoding import from_square_of, to_square_of, special_move_of
+from test_via_pgn import check_move_made_in_piece_moves
+from game_classes.constants import PIECE_TYPES
+PAWNS, KNIGHTS, BISHOPS, ROOKS, QUEENS, KINGS = PIECE_TYPES
+
+PGN_FILE = f'{os.path.dirname(__file__)}/game_data/lichess_db_standard_rated_2013-01.pgn'
+SAMPLE_EVERY = 4  # plies
+
+
+def positions_from_pgn(num_games):
+    games = []
+    with open(PGN_FILE) as file:
+        for line in file:
+            if not line.startswith('[') and len(line.strip()) != 0:
+                games.append(re.sub('{.*?}', '', line))
+            if len(games) == num_games:
+                break
+
+    for game_str in games:
+        game = Game()
+        game.calculate_legal_moves()
+        game_moves = [move for move in game_str.split() if '.' not in move][:-1]
+        for move_num, move_played in enumerate(game_moves):
+            if move_num % SAMPLE_EVERY == 0:
+                yield game.position
+            if re.search('[RBNQ][a-h][1-8]x?[a-h][1-8]', move_played):
+                move_played = move_played[0] + move_played[2:]
+            piece_type = move_played[0] if move_played[0] in PIECE_TYPES else PAWNS
+            if 'O-O' in move_played:
+                piece_type = KINGS
+            colour = game.position.side_to_move
+            move = check_move_made_in_piece_moves(move_played, game.get_all_legal_moves()[colour][piece_type])
+            if move is None:
+                break
+            game.make_move(move['from_loc'], move['to_loc'], move['special_move'])
+
+
+def positions_from_random_games(num_games):
+    rng = random.Random(0)
+    for _ in range(num_games):
+        game = Game()
+        game.calculate_legal_moves()
+        for ply in range(200):
+            if game.game_status.game_finished:
+                break
+            if ply % SAMPLE_EVERY == 0:
+                yield game.position
+            move = rng.choice(game.position.legal_moves())
+            game.make_move(loc_of(from_square_of(move)), loc_of(to_square_of(move)), special_move_of(move))
+
+
+def main():
+    settings.init()
+    settings.set_debug(True)  # test_via_pgn matches moves by name
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    if os.path.exists(PGN_FILE):
+        positions = positions_from_pgn(num_games)
+    else:
+        print(f'{PGN_FILE} not found, using positions from random games')
+        positions = positions_from_random_games(num_games)
+
+    legal_terms = []
+    attack_terms = []
+    legal_time = 0
+    attack_time = 0
+    for position in positions:
+        start = timer()
+        legal_term = len(position.legal_moves('white')) - len(position.legal_moves('black'))
+        legal_time += timer() - start
+
+        start = timer()
+        attack_term = position.mobility('white') - position.mobility('black')
+        attack_time += timer() - start
+
+        legal_terms.append(legal_term)
+        attack_terms.append(attack_term)
+
+    num_positions = len(legal_terms)
+    print(f'positions: {num_positions}')
+    print(f'correlation of white - black mobility: {correlation(legal_terms, attack_terms):.3f}')
+    print(f'legal moves:  {legal_time / num_positions * 1e6:.1f}us per position')
+    print(f'attack sets:  {attack_time / num_positions * 1e6:.1f}us per position')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Searches the search_benchmark.py positions with and without the move ordering heuristics
+# (MVV-LVA, killer moves and history, see game_classes/move_ordering.py) and reports the nodes,
+# the time and how many beta cutoffs came from the first move tried. Everything the search
+# remembers is cleared before each search so they're measured on their own.
+#
+# python move_ordering_benchmark.py              depth 3
+# python move_ordering_benchmark.py --depth 4
+
+import argparse
+from timeit import default_timer as timer
+from game_classes.ai import ChessAI, TreeNode
+from game_classes.position import Position
+from game_classes.move_encoding import uci_string_of
+from game_classes import settings
+from search_benchmark import POSITIONS
+
+
+def search(fen: str, depth: int, ordering_heuristics: bool):
+    settings.set_ordering_heuristics(ordering_heuristics)
+    ChessAI.clear_search_memory()
+    position = Position.from_fen(fen)
+    tree = TreeNode(ChessAI.get_game_state(position))
+    start = timer()
+    ChessAI.calculate_deep_moves(tree, depth)
+    elapsed = timer() - start
+    first_move_rate = ChessAI.first_move_cutoffs / ChessAI.cutoffs if ChessAI.cutoffs else 0
+    return tree.best_move, ChessAI.nodes_searched, first_move_rate, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=3)
+    args = parser.parse_args()
+    settings.init()
+
+    total_nodes = {True: 0, False: 0}
+    print(f'{"":<14} {"heuristics":>37} | {"generation order":>37}')
+    for name, fen in POSITIONS:
+        line = f'{name:<14}'
+        for ordering_heuristics in (True, False):
+            best_move, nodes, first_move_rate, elapsed = search(fen, args.depth, ordering_heuristics)
+            total_nodes[ordering_heuristics] += nodes
+            line += f' {uci_string_of(best_move)} {nodes:>8} nodes {first_move_rate:>6.1%} first {elapsed:>6.2f}s'
+            if ordering_heuristics:
+                line += ' |'
+        print(line)
+
+    print(
+        f'nodes: {total_nodes[True]} vs {total_nodes[False]} in generation order '
+        f'({1 - total_nodes[True] / total_nodes[False]:.1%} fewer)'
+    )
+
+
+if __name__ == '__main__':
+    main()
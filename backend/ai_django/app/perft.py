@@ -0,0 +1,109 @@
+# Counts the move sequences of a given length from reference positions and checks them against the
+# known counts, to check the move generator and measure how fast it is.
+#
+# python perft.py                        every reference position to depth 3
+# python perft.py --depth 4 --processes 4
+# python perft.py --fen "<fen>" --depth 3 --divide
+
+import argparse
+import sys
+from multiprocessing import Pool
+from timeit import default_timer as timer
+from game_classes.position import Position
+from game_classes.move_encoding import uci_string_of
+
+# (name, FEN, node counts at depth 1, 2, ...) - from https://www.chessprogramming.org/Perft_Results
+REFERENCE_POSITIONS = [
+    (
+        'start',
+        'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+        [20, 400, 8902, 197281, 4865609]
+    ),
+    (
+        'kiwipete',
+        'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+        [48, 2039, 97862, 4085603]
+    ),
+    (
+        'position 3',
+        '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+        [14, 191, 2812, 43238, 674624]
+    ),
+    (
+        'position 4',
+        'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+        [6, 264, 9467, 422333]
+    ),
+    (
+        'position 5',
+        'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+        [44, 1486, 62379, 2103487]
+    ),
+    (
+        'position 6',
+        'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+        [46, 2079, 89890, 3894594]
+    ),
+]
+
+
+def perft_after_move(args):
+    fen, move, depth = args
+    position = Position.from_fen(fen)
+    position.make_move(move)
+    return move, position.perft(depth - 1)
+
+
+# same result as Position.divide, with the first moves shared out between processes
+def divide(fen: str, depth: int, processes: int = 1):
+    position = Position.from_fen(fen)
+    if processes <= 1 or depth <= 1:
+        return position.divide(depth)
+    with Pool(processes) as pool:
+        return dict(pool.map(perft_after_move, [(fen, move, depth) for move in position.generate_legal_moves()]))
+
+
+def run(name: str, fen: str, depth: int, processes: int, show_divide: bool, expected_nodes: 'int | None' = None):
+    start = timer()
+    counts = divide(fen, depth, processes)
+    elapsed = timer() - start
+    nodes = sum(counts.values())
+
+    if show_divide:
+        for move, count in sorted(counts.items(), key=lambda item: uci_string_of(item[0])):
+            print(f'    {uci_string_of(move)}: {count}')
+    result = ''
+    if expected_nodes is not None:
+        result = 'OK' if nodes == expected_nodes else f'FAIL (expected {expected_nodes})'
+    print(f'{name} depth {depth}: {nodes} nodes in {elapsed:.2f}s, {nodes / elapsed:.0f} nps {result}')
+    return expected_nodes is None or nodes == expected_nodes, nodes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--fen', help='count from this position instead of the reference positions')
+    parser.add_argument('--divide', action='store_true', help='print the count after each first move')
+    parser.add_argument('--processes', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.fen is not None:
+        run('fen', args.fen, args.depth, args.processes, args.divide)
+        return
+
+    all_correct = True
+    total_nodes = 0
+    total_time = 0
+    for name, fen, expected_counts in REFERENCE_POSITIONS:
+        depth = min(args.depth, len(expected_counts))
+        correct, nodes, elapsed = run(name, fen, depth, args.processes, args.divide, expected_counts[depth - 1])
+        all_correct = all_correct and correct
+        total_nodes += nodes
+        total_time += elapsed
+    print(f'total: {total_nodes} nodes in {total_time:.2f}s, {total_nodes / total_time:.0f} nps')
+    if not all_correct:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
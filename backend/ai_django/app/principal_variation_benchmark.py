@@ -0,0 +1,66 @@
+# Searches the search_benchmark.py positions with iterative deepening to a fixed depth, with and
+# without principal variation search and aspiration windows (see ChessAI.calculate_deep_moves and
+# ChessAI.iterative_deepening), and reports the nodes each took and whether the best move is the
+# same as with neither. Everything the search remembers is cleared before each search so they're
+# measured on their own.
+#
+# python principal_variation_benchmark.py              depth 4
+# python principal_variation_benchmark.py --depth 3
+
+import argparse
+from timeit import default_timer as timer
+from game_classes.ai import ChessAI, TreeNode
+from game_classes.position import Position
+from game_classes.move_encoding import uci_string_of
+from game_classes import settings
+from search_benchmark import POSITIONS
+
+CONFIGURATIONS = {
+    'neither': (False, False),
+    'pvs': (True, False),
+    'aspiration': (False, True),
+    'both': (True, True),
+}
+
+
+def search(fen: str, depth: int, principal_variation_search: bool, aspiration_windows: bool):
+    settings.set_principal_variation_search(principal_variation_search)
+    settings.set_aspiration_windows(aspiration_windows)
+    ChessAI.clear_search_memory()
+    tree = TreeNode(ChessAI.get_game_state(Position.from_fen(fen)))
+    start = timer()
+    ChessAI.iterative_deepening(tree, max_depth=depth)
+    return tree.best_move, ChessAI.nodes_searched, timer() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=4)
+    args = parser.parse_args()
+    settings.init()
+
+    total_nodes = {name: 0 for name in CONFIGURATIONS}
+    total_time = {name: 0.0 for name in CONFIGURATIONS}
+    same_moves = {name: 0 for name in CONFIGURATIONS}
+    for position_name, fen in POSITIONS:
+        line = f'{position_name:<14}'
+        baseline_move = None
+        for name, (principal_variation_search, aspiration_windows) in CONFIGURATIONS.items():
+            best_move, nodes, elapsed = search(fen, args.depth, principal_variation_search, aspiration_windows)
+            if baseline_move is None:
+                baseline_move = best_move
+            total_nodes[name] += nodes
+            total_time[name] += elapsed
+            same_moves[name] += best_move == baseline_move
+            line += f' | {name} {uci_string_of(best_move)} {nodes:>7}'
+        print(line)
+
+    for name in CONFIGURATIONS:
+        print(
+            f'{name:<11} {total_nodes[name]:>8} nodes {1 - total_nodes[name] / total_nodes["neither"]:>6.1%} saved '
+            f'{total_time[name]:>7.2f}s  same best move in {same_moves[name]}/{len(POSITIONS)}'
+        )
+
+
+if __name__ == '__main__':
+    main()
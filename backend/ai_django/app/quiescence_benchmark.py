@@ -0,0 +1,82 @@
+# Compares a fixed depth search with quiescence search (see ChessAI.quiescence) against the same
+# depth and one more ply without it: the nodes and time on the search_benchmark.py positions, and
+# optionally the result of games between depth + quiescence and depth + 1, started from each
+# position with both colours. Games that last --max-plies moves count as draws.
+#
+# python quiescence_benchmark.py                    depth 2
+# python quiescence_benchmark.py --depth 2 --games
+
+import argparse
+from timeit import default_timer as timer
+from game_classes.ai import ChessAI, TreeNode
+from game_classes.position import Position
+from game_classes.move_encoding import uci_string_of
+from game_classes import settings
+from search_benchmark import POSITIONS
+
+
+def search(position: Position, depth: int, quiescence: bool):
+    settings.set_quiescence(quiescence)
+    tree = TreeNode(ChessAI.get_game_state(position))
+    start = timer()
+    ChessAI.calculate_deep_moves(tree, depth)
+    return tree, timer() - start
+
+
+# 1 if the side searching with quiescence wins, 0.5 for a draw and 0 for a loss
+def play_game(fen: str, depth: int, quiescence_colour: str, max_plies: int) -> float:
+    position = Position.from_fen(fen)
+    for _ in range(max_plies):
+        quiescence = position.side_to_move == quiescence_colour
+        tree, _ = search(position, depth if quiescence else depth + 1, quiescence)
+        game_status = tree.game_state_after_move.game_status
+        if game_status.game_finished:
+            if game_status.winner is None:
+                return 0.5
+            return 1 if game_status.winner == quiescence_colour else 0
+        position.make_move(tree.best_move)
+    return 0.5
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--games', action='store_true', help='also play depth + quiescence against depth + 1')
+    parser.add_argument('--max-plies', type=int, default=160)
+    args = parser.parse_args()
+    settings.init()
+
+    columns = ((args.depth, True), (args.depth, False), (args.depth + 1, False))
+    total_nodes = [0] * len(columns)
+    total_time = [0.0] * len(columns)
+    print(f'{"":<14}' + ''.join(
+        f' | {f"depth {depth}" + (" + quiescence" if quiescence else ""):<27}' for depth, quiescence in columns
+    ).rstrip())
+    for name, fen in POSITIONS:
+        line = f'{name:<14}'
+        for i, (depth, quiescence) in enumerate(columns):
+            ChessAI.clear_search_memory()
+            tree, elapsed = search(Position.from_fen(fen), depth, quiescence)
+            total_nodes[i] += ChessAI.nodes_searched
+            total_time[i] += elapsed
+            line += f' | {uci_string_of(tree.best_move)} {ChessAI.nodes_searched:>8} nodes {elapsed:>6.2f}s'
+        print(line)
+    print(f'{"total":<14}' + ''.join(
+        f' |      {nodes:>8} nodes {elapsed:>6.2f}s' for nodes, elapsed in zip(total_nodes, total_time)
+    ))
+
+    if args.games:
+        score = 0.0
+        for name, fen in POSITIONS:
+            for quiescence_colour in ('white', 'black'):
+                result = play_game(fen, args.depth, quiescence_colour, args.max_plies)
+                score += result
+                print(f'{name:<14} quiescence as {quiescence_colour:<5} {result}')
+        print(
+            f'depth {args.depth} + quiescence scored {score} / {2 * len(POSITIONS)} '
+            f'against depth {args.depth + 1}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Searches fixed positions with ChessAI.calculate_deep_moves and with plain minimax
+# (ChessAI.minimax), and reports the nodes and time each took and whether they picked the same move,
+# and the transposition table's hit rate.
+#
+# python search_benchmark.py --no-quiescence   depth 2 (minimax is very slow with quiescence search)
+# python search_benchmark.py --depth 3 --no-minimax
+# python search_benchmark.py --depth 4 --no-minimax --tt-mb 0     without a transposition table
+
+import argparse
+from timeit import default_timer as timer
+from game_classes.ai import ChessAI, TreeNode
+from game_classes.position import Position
+from game_classes.move_encoding import uci_string_of
+from game_classes import settings
+
+POSITIONS = [
+    ('start', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'),
+    ('italian', 'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4'),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'),
+    ('position 4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1'),
+    ('position 6', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10'),
+    ('rook endgame', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1'),
+]
+
+
+def search(fen: str, depth: int, search_function):
+    position = Position.from_fen(fen)
+    tree = TreeNode(ChessAI.get_game_state(position))
+    ChessAI.nodes_searched = 0
+    start = timer()
+    search_function(tree, depth)
+    return tree.best_move, tree.eval, ChessAI.nodes_searched, timer() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--no-minimax', action='store_true', help="don't run the minimax search to compare with")
+    parser.add_argument('--tt-mb', type=float, default=None, help='transposition table size in MB, 0 to turn it off')
+    parser.add_argument('--no-quiescence', action='store_true', help='evaluate leaves without quiescence search')
+    args = parser.parse_args()
+    settings.init()
+    settings.set_quiescence(not args.no_quiescence)
+    if args.tt_mb is not None:
+        settings.set_transposition_table_mb(args.tt_mb)
+
+    total_nodes = {'minimax': 0, 'search': 0}
+    for name, fen in POSITIONS:
+        best_move, score, nodes, elapsed = search(fen, args.depth, ChessAI.calculate_deep_moves)
+        total_nodes['search'] += nodes
+        line = f'{name:<14} {uci_string_of(best_move)} {score:>7.2f} {nodes:>9} nodes {elapsed:>7.2f}s'
+        if ChessAI.transposition_table is not None:
+            line += f' {ChessAI.transposition_table.hit_rate():>6.1%} tt hits'
+        if not args.no_minimax:
+            minimax_move, minimax_score, minimax_nodes, minimax_elapsed = search(fen, args.depth, ChessAI.minimax)
+            total_nodes['minimax'] += minimax_nodes
+            same = 'same' if (minimax_move, minimax_score) == (best_move, score) else 'DIFFERENT'
+            line += f'  | minimax {minimax_nodes:>9} nodes {minimax_elapsed:>7.2f}s {same}'
+        print(line)
+
+    if not args.no_minimax:
+        print(f'nodes: {total_nodes["search"]} vs {total_nodes["minimax"]} for minimax')
+
+
+if __name__ == '__main__':
+    main()
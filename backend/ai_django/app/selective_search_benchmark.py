@@ -0,0 +1,61 @@
+# Searches the search_benchmark.py positions with none of the selective search techniques (see
+# NULL_MOVE_REDUCTION in game_classes/ai.py), with each one on its own and with all of them, and
+# reports the nodes each saves against none and whether it changed the best move. Everything the
+# search remembers is cleared before each search so they're measured on their own.
+#
+# python selective_search_benchmark.py              depth 4
+# python selective_search_benchmark.py --depth 3
+
+import argparse
+from timeit import default_timer as timer
+from game_classes.ai import ChessAI, TreeNode
+from game_classes.position import Position
+from game_classes import settings
+from search_benchmark import POSITIONS
+
+TECHNIQUES = {
+    'null move': settings.set_null_move_pruning,
+    'late move reductions': settings.set_late_move_reductions,
+    'futility pruning': settings.set_futility_pruning,
+    'razoring': settings.set_razoring,
+}
+
+
+def search(fen: str, depth: int, techniques):
+    for technique, set_technique in TECHNIQUES.items():
+        set_technique(technique in techniques)
+    ChessAI.clear_search_memory()
+    tree = TreeNode(ChessAI.get_game_state(Position.from_fen(fen)))
+    start = timer()
+    ChessAI.calculate_deep_moves(tree, depth)
+    return tree.best_move, ChessAI.nodes_searched, timer() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=4)
+    args = parser.parse_args()
+    settings.init()
+
+    configurations = [('none', ())] + [(technique, (technique,)) for technique in TECHNIQUES]
+    configurations.append(('all', tuple(TECHNIQUES)))
+    results = {
+        name: [search(fen, args.depth, techniques) for _, fen in POSITIONS] for name, techniques in configurations
+    }
+
+    baseline_nodes = sum(nodes for _, nodes, _ in results['none'])
+    for name, _ in configurations:
+        nodes = sum(nodes for _, nodes, _ in results[name])
+        elapsed = sum(elapsed for _, _, elapsed in results[name])
+        same_moves = sum(
+            best_move == baseline_move
+            for (best_move, _, _), (baseline_move, _, _) in zip(results[name], results['none'])
+        )
+        print(
+            f'{name:<22} {nodes:>8} nodes {1 - nodes / baseline_nodes:>6.1%} saved {elapsed:>7.2f}s  '
+            f'same best move in {same_moves}/{len(POSITIONS)}'
+        )
+
+
+if __name__ == '__main__':
+    main()
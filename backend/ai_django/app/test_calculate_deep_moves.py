@@ -34,11 +34,9 @@ for i in range(4):
 
     end = timer()
 
-    print(game.move_tree.best_move)
-    print(game.move_tree.eval)
-    print(f'Time taken: {end - start}')
-
-    best_move = game.move_tree.best_move
-    assert best_move is not None
+    score = game.move_tree.eval
+    game.play_best_move()
 
-    game.make_move(best_move.from_loc, best_move.to_loc, best_move.special_move)
+    print(game.move_history[-1])
+    print(score)
+    print(f'Time taken: {end - start}')
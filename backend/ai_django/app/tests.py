@@ -60,3 +60,648 @@ class GameTests(TestCase):
         game.make_move((1, 4), (3, 4))
         self.print(game)
         self.print(game.info())
+
+    def test_position(self):
+        from .game_classes.game import Game
+        from .game_classes.bitboards import square_of
+        print(coloured(150, 0, 255, 'Running test_position'))
+        game = Game()
+        game.calculate_legal_moves()
+        for from_loc, to_loc in (((1, 4), (3, 4)), ((6, 5), (4, 5)), ((0, 3), (4, 7))):
+            game.make_move(from_loc, to_loc)
+        self.assertTrue(game.game_status.black_in_check)
+        self.assertTrue(game.position.in_check('black'))
+        self.assertFalse(game.position.in_check('white'))
+        self.assertTrue(game.position.is_square_attacked(square_of((5, 6)), 'white'))
+        self.assertFalse(game.position.is_square_attacked(square_of((4, 0)), 'white'))  # blocked by f5
+        self.assertFalse(game.position.is_king_move_safe('black', square_of((6, 5))))
+        for row in range(8):
+            for col in range(8):
+                piece = game.board[row][col]
+                square = square_of((row, col))
+                self.assertEqual(game.position.mailbox[square], None if piece is None else piece.get_type())
+                self.assertEqual(game.position.colour_at(square), None if piece is None else piece.colour)
+
+    def test_legal_move_generation(self):
+        from .game_classes.game import Game
+        from .game_classes.bitboards import square_of
+        from .game_classes.move_encoding import encode_move, from_square_of
+        print(coloured(150, 0, 255, 'Running test_legal_move_generation'))
+        game = Game()
+        game.calculate_legal_moves()
+        for from_loc, to_loc in (((1, 4), (3, 4)), ((6, 5), (4, 5)), ((0, 3), (4, 7))):
+            game.make_move(from_loc, to_loc)
+        # the only way out of Qh5+ is to block on g6
+        self.assertEqual(game.position.legal_moves(), [encode_move(square_of((6, 6)), square_of((5, 6)))])
+        self.assertEqual(game.black_player.num_legal_moves, 1)
+
+        game = Game()
+        game.calculate_legal_moves()
+        for from_loc, to_loc in (((1, 4), (3, 4)), ((6, 4), (4, 4)), ((0, 5), (4, 1))):
+            game.make_move(from_loc, to_loc)
+        # Bb5 pins the d7 pawn to the king
+        d7 = square_of((6, 3))
+        self.assertEqual(game.position.pinned_pieces('black', square_of((7, 4))), 1 << d7)
+        self.assertFalse(any(from_square_of(move) == d7 for move in game.position.legal_moves()))
+        self.assertEqual(game.board[6][3].legal_moves, [])
+
+        # the attack-set estimate counts pseudo-legal moves, so the pinned pawn's moves are in it
+        position = game.position
+        self.assertEqual(position.mobility('black'), len(position.pseudo_legal_moves('black')))
+        self.assertEqual(Game().position.mobility('white'), 20)
+
+    def test_attack_tables(self):
+        import random
+        from .game_classes.bitboards import bishop_attacks, rook_attacks
+        from .game_classes.attack_tables import bishop_attacks_from, rook_attacks_from, BETWEEN, LINE
+        print(coloured(150, 0, 255, 'Running test_attack_tables'))
+        rng = random.Random(0)
+        for _ in range(1000):
+            square = rng.randrange(64)
+            occupied = rng.getrandbits(64) & rng.getrandbits(64)
+            self.assertEqual(bishop_attacks_from(square, occupied), bishop_attacks(1 << square, occupied))
+            self.assertEqual(rook_attacks_from(square, occupied), rook_attacks(1 << square, occupied))
+        self.assertEqual(BETWEEN[0][3], 0b110)  # a1-d1
+        self.assertEqual(BETWEEN[0][10], 0)  # a1-c2 isn't a line
+        self.assertEqual(LINE[9][18], 0x8040_2010_0804_0201)  # b2-c3 is on the long diagonal
+
+    def test_draw_by_repetition(self):
+        from .game_classes.game import Game
+        from .game_classes.position import Position
+        print(coloured(150, 0, 255, 'Running test_draw_by_repetition'))
+        game = Game()
+        game.calculate_legal_moves()
+        knight_moves = (((0, 6), (2, 5)), ((7, 6), (5, 5)), ((2, 5), (0, 6)), ((5, 5), (7, 6)))
+        for _ in range(2):
+            for from_loc, to_loc in knight_moves:
+                self.assertFalse(game.game_status.game_finished)
+                game.make_move(from_loc, to_loc)
+        # the starting position has now been reached 3 times
+        self.assertEqual(game.game_status.draw_by, '3-fold repetition')
+        self.assertEqual(game.game_status.to_dict()['game_result'], 'draw')
+        self.assertEqual(game.position.halfmove_clock, 8)
+        game.position.unmake_move()
+        self.assertEqual(game.position.is_draw(False, 20), (False, None))
+
+        # a halfmove clock from a FEN only counts as 50 moves without a pawn move or capture once it reaches 99,
+        # since the moves before the position was set up aren't known
+        position = Position.from_fen('4k3/8/8/8/8/8/8/R3K3 w - - 50 26')
+        self.assertEqual(position.is_draw(False, len(position.legal_moves())), (False, None))
+        position = Position.from_fen('4k3/8/8/8/8/8/8/R3K3 w - - 99 60')
+        self.assertEqual(position.is_draw(False, len(position.legal_moves())), (True, '50-move rule'))
+
+    def test_make_unmake_move(self):
+        from .game_classes.game import Game
+        from .game_classes.position import Position
+        from .game_classes.constants import SHORT_CASTLE, ENPASSANT_LEFT
+        from .game_classes.move_encoding import special_move_of
+        print(coloured(150, 0, 255, 'Running test_make_unmake_move'))
+        game = Game()
+        game.calculate_legal_moves()
+        for from_loc, to_loc in (
+            ((1, 4), (3, 4)), ((6, 0), (5, 0)), ((0, 6), (2, 5)), ((5, 0), (4, 0)),
+            ((0, 5), (1, 4)), ((4, 0), (3, 0)), ((3, 4), (4, 4)), ((6, 3), (4, 3))
+        ):
+            game.make_move(from_loc, to_loc)
+        position = game.position
+
+        def state():
+            return (
+                dict(position.pieces['white']),
+                dict(position.pieces['black']),
+                dict(position.occupied),
+                list(position.mailbox),
+                position.side_to_move,
+                position.castling_rights,
+                position.ep_square,
+                dict(position.material),
+                position.piece_square_score,
+                position.phase,
+                position.halfmove_clock,
+                position.ply,
+                position.hash,
+                dict(position.repetitions),
+            )
+
+        def make_and_unmake_all(depth):
+            before = state()
+            for move in position.legal_moves():
+                position.make_move(move)
+                if depth > 1:
+                    make_and_unmake_all(depth - 1)
+                position.unmake_move()
+                self.assertEqual(state(), before)
+
+        # the incrementally updated hash matches one computed from scratch
+        self.assertEqual(
+            Position.from_players(game.white_player, game.black_player, game.move_history).hash, position.hash
+        )
+
+        special_moves = {special_move_of(move) for move in position.legal_moves()}
+        self.assertIn(SHORT_CASTLE, special_moves)
+        self.assertIn(ENPASSANT_LEFT, special_moves)
+        make_and_unmake_all(2)
+
+    def test_incremental_move_generation(self):
+        import random
+        from .game_classes.game import Game
+        from .game_classes.bitboards import square_of, loc_of
+        from .game_classes.move_encoding import from_square_of, to_square_of, special_move_of
+        print(coloured(150, 0, 255, 'Running test_incremental_move_generation'))
+        rng = random.Random(0)
+        game = Game()
+        game.calculate_legal_moves()
+        while not game.game_status.game_finished and len(game.move_history) < 150:
+            move = rng.choice(game.position.legal_moves())
+            game.make_move(loc_of(from_square_of(move)), loc_of(to_square_of(move)), special_move_of(move))
+            # the moves kept from before the last move are the same as regenerating them
+            for player in game.players:
+                for pieces in player.pieces.values():
+                    for piece in pieces:
+                        self.assertEqual(piece.pseudo_legal_moves, game.position.moves_from(square_of(piece.loc)))
+
+    def test_one_sided_search(self):
+        import random
+        from .game_classes.game import Game
+        from .game_classes.ai import ChessAI
+        from .game_classes.game_logic import Logic
+        print(coloured(150, 0, 255, 'Running test_one_sided_search'))
+        rng = random.Random(1)
+        game = Game()
+        game.calculate_legal_moves()
+        position = game.position
+        settings.set_one_sided_search(True)
+        try:
+            game.update_move_tree(2)
+            self.assertIsNotNone(game.move_tree.best_move)
+            for _ in range(120):
+                legal_moves = position.legal_moves()
+                self.assertEqual(position.has_legal_move(), len(legal_moves) > 0)
+                game_state = ChessAI.get_game_state(position)
+                self.assertEqual(
+                    game_state.game_status.to_dict(),
+                    Logic.get_position_status(position, len(legal_moves)).to_dict()
+                )
+                self.assertEqual(game_state.legal_moves, legal_moves)
+                if game_state.game_status.game_finished:
+                    break
+                position.make_move(rng.choice(legal_moves))
+        finally:
+            settings.set_one_sided_search(False)
+
+    def test_move_names(self):
+        from .game_classes.game import Game
+        print(coloured(150, 0, 255, 'Running test_move_names'))
+        game = Game()
+        game.calculate_legal_moves()
+        for from_loc, to_loc in (
+            ((1, 3), (3, 3)), ((6, 0), (5, 0)), ((0, 6), (2, 5)), ((5, 0), (4, 0)), ((0, 1), (1, 3))
+        ):
+            game.make_move(from_loc, to_loc)
+        last_move = game.move_history[-1]
+        # names are only put together when they're needed, then kept
+        self.assertIsNone(last_move._move_name)
+        self.assertEqual(str(last_move), 'Nbd2')
+        self.assertEqual(last_move._move_name, 'Nbd2')
+        self.assertEqual([str(move) for move in game.move_history], ['d4', 'a6', 'Nf3', 'a5', 'Nbd2'])
+
+    def test_staged_legal_moves(self):
+        import random
+        from .game_classes.game import Game
+        print(coloured(150, 0, 255, 'Running test_staged_legal_moves'))
+        rng = random.Random(2)
+        game = Game()
+        game.calculate_legal_moves()
+        position = game.position
+        for _ in range(150):
+            legal_moves = position.legal_moves()
+            if len(legal_moves) == 0:
+                break
+            hash_move = rng.choice(legal_moves)
+            staged_moves = list(position.staged_legal_moves(hash_move))
+            self.assertEqual(staged_moves[0], hash_move)
+            self.assertEqual(sorted(staged_moves), sorted(legal_moves))
+            # captures and promotions come before every other move
+            captures = position.generate_legal_moves(quiets=False)
+            self.assertEqual(
+                [move for move in staged_moves[1:] if move in captures],
+                staged_moves[1:len(captures) + (hash_move not in captures)]
+            )
+            position.make_move(rng.choice(legal_moves))
+
+    def test_perft(self):
+        from .game_classes.game import Game
+        from .game_classes.position import Position
+        print(coloured(150, 0, 255, 'Running test_perft'))
+        # a few of the positions in perft.py
+        for fen, depth, expected_nodes in (
+            ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', 2, 2039),
+            ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', 3, 2812),
+            ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', 2, 264),
+            ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', 2, 1486),
+        ):
+            self.assertEqual(Position.from_fen(fen).perft(depth), expected_nodes)
+        game = Game()
+        game.calculate_legal_moves()
+        self.assertEqual(game.perft(3), 8902)
+        self.assertEqual(sum(game.divide(2).values()), 400)
+        start_position = Position.from_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+        self.assertEqual(start_position.hash, game.position.hash)
+
+    def test_fen(self):
+        from .game_classes.game import Game
+        print(coloured(150, 0, 255, 'Running test_fen'))
+        game = Game()
+        game.calculate_legal_moves()
+        self.assertEqual(game.to_fen(), 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+        for from_loc, to_loc in (((1, 4), (3, 4)), ((6, 2), (4, 2)), ((0, 6), (2, 5))):
+            game.make_move(from_loc, to_loc)
+        fen = 'rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2'
+        self.assertEqual(game.to_fen(), fen)
+
+        loaded_game = Game.from_fen(fen)
+        self.assertEqual(loaded_game.to_fen(), fen)
+        self.assertEqual(loaded_game.position.hash, game.position.hash)
+        self.assertEqual(loaded_game.black_player.num_legal_moves, game.black_player.num_legal_moves)
+        loaded_game.make_move((7, 1), (5, 2))
+        self.assertEqual(str(loaded_game.move_history[-1]), 'Nc6')
+
+        # black to move and mated
+        game = Game.from_fen('4k3/4Q3/4K3/8/8/8/8/8 b - - 0 60')
+        self.assertEqual(game.game_status.game_result, 'checkmate')
+        self.assertTrue(game.game_status.black_in_check)
+        self.assertEqual(game.material['white'], {'P': 8, 'N': 2, 'B': 2, 'R': 2, 'Q': 1})
+
+    def test_piece_square_evaluation(self):
+        import random
+        from .game_classes.game import Game
+        from .game_classes.position import Position
+        print(coloured(150, 0, 255, 'Running test_piece_square_evaluation'))
+        game = Game()
+        game.calculate_legal_moves()
+        position = game.position
+        self.assertEqual(position.piece_square_evaluation(), 0)
+        rng = random.Random(3)
+        for _ in range(100):
+            legal_moves = position.legal_moves()
+            if len(legal_moves) == 0:
+                break
+            position.make_move(rng.choice(legal_moves))
+            # the incrementally updated score is the same as one added up from scratch
+            loaded_position = Position.from_fen(position.to_fen())
+            self.assertEqual(loaded_position.piece_square_score, position.piece_square_score)
+            self.assertEqual(loaded_position.phase, position.phase)
+
+        # with only kings and pawns left the endgame tables are used
+        position = Position.from_fen('4k3/8/8/8/8/8/4P3/4K3 w - - 0 1')
+        self.assertEqual(position.phase, 0)
+        self.assertEqual(position.piece_square_evaluation(), 120)
+
+        settings.set_evaluator('piece_square')
+        try:
+            game = Game()
+            game.calculate_legal_moves()
+            game.update_move_tree(2)
+            self.assertIsNotNone(game.move_tree.best_move)
+        finally:
+            settings.set_evaluator('material')
+
+    def test_alpha_beta(self):
+        from .game_classes.ai import ChessAI, TreeNode
+        from .game_classes.position import Position
+        print(coloured(150, 0, 255, 'Running test_alpha_beta'))
+        # minimax takes too long with quiescence search
+        settings.set_quiescence(False)
+        try:
+            for fen in (
+                'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+                'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4',
+                'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+            ):
+                position = Position.from_fen(fen)
+                ChessAI.nodes_searched = 0
+                minimax_tree = ChessAI.minimax(TreeNode(ChessAI.get_game_state(position)), 2)
+                minimax_nodes = ChessAI.nodes_searched
+                tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(position)), 2)
+                # same move and eval as minimax, from fewer nodes
+                self.assertEqual((tree.best_move, tree.eval), (minimax_tree.best_move, minimax_tree.eval))
+                self.assertLess(ChessAI.nodes_searched, minimax_nodes)
+        finally:
+            settings.set_quiescence(True)
+
+        # Moves are generated by from square, then to square (not by piece and direction, as the
+        # Player pieces did), and with equal evals the last one in that order is played: Kd2 and Kf2
+        # both score the same here
+        from .game_classes.move_encoding import uci_string_of
+        position = Position.from_fen('8/8/8/4k3/8/8/4P3/4K3 w - - 0 1')
+        self.assertEqual(
+            [uci_string_of(move) for move in position.legal_moves()],
+            ['e1d1', 'e1f1', 'e1d2', 'e1f2', 'e2e3', 'e2e4']
+        )
+        minimax_tree = ChessAI.minimax(TreeNode(ChessAI.get_game_state(position)), 2)
+        best_moves = [
+            uci_string_of(move) for move, child in minimax_tree.children.items() if child.eval == minimax_tree.eval
+        ]
+        self.assertEqual(sorted(best_moves), ['e1d2', 'e1f2'])
+        tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(position)), 2)
+        self.assertEqual(uci_string_of(tree.best_move), 'e1f2')
+        self.assertEqual(uci_string_of(minimax_tree.best_move), 'e1f2')
+
+    def test_transposition_table(self):
+        from .game_classes.ai import ChessAI, TreeNode
+        from .game_classes.position import Position
+        from .game_classes.transposition_table import TranspositionTable, EXACT, LOWER_BOUND
+        from .game_classes.game import Game
+        print(coloured(150, 0, 255, 'Running test_transposition_table'))
+        # a single bucket: the deeper result keeps the first slot and the second is always replaced
+        table = TranspositionTable(0)
+        self.assertEqual(table.num_buckets, 1)
+        table.store(1, 3, EXACT, 0.5, 100)
+        table.store(2, 1, LOWER_BOUND, 1, 200)
+        self.assertEqual(table.probe(1), (1, 3, EXACT, 0.5, 100))
+        self.assertEqual(table.probe(2), (2, 1, LOWER_BOUND, 1, 200))
+        table.store(3, 2, EXACT, 0, 300)
+        self.assertIsNone(table.probe(2))
+        self.assertIsNotNone(table.probe(1))
+        table.store(4, 5, EXACT, 0, 400)
+        self.assertIsNone(table.probe(1))
+        self.assertIsNotNone(table.probe(3))
+        self.assertEqual(table.hit_rate(), 4 / 6)
+
+        # same result with and without the table, searching fewer nodes with it. The tree keeps
+        # best moves to try first without the table, so the moves are ordered alike
+        fen = '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1'
+        results = []
+        try:
+            settings.set_tree_free_search(False)
+            for size_mb in (0, 1):
+                settings.set_transposition_table_mb(size_mb)
+                tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), 4)
+                results.append((tree.best_move, tree.eval, ChessAI.nodes_searched))
+        finally:
+            settings.set_transposition_table_mb(16)
+            settings.set_tree_free_search(True)
+        self.assertEqual(results[0][:2], results[1][:2])
+        self.assertLess(results[1][2], results[0][2])
+        self.assertGreater(ChessAI.transposition_table.hit_rate(), 0)
+
+        # a new game starts with an empty table
+        table = ChessAI.transposition_table
+        self.assertTrue(any(slot is not None for slot in table.slots))
+        Game.from_fen(fen)
+        self.assertTrue(all(slot is None for slot in table.slots))
+
+    def test_iterative_deepening(self):
+        from .game_classes.ai import ChessAI, TreeNode
+        from .game_classes.position import Position
+        from .game_classes.game import Game
+        print(coloured(150, 0, 255, 'Running test_iterative_deepening'))
+        fen = 'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4'
+        position = Position.from_fen(fen)
+        tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(position)), 2)
+        depth_2_result = (tree.best_move, tree.eval)
+
+        tree = ChessAI.iterative_deepening(TreeNode(ChessAI.get_game_state(position)), max_depth=2)
+        self.assertEqual(ChessAI.completed_depth, 2)
+        self.assertEqual((tree.best_move, tree.eval), depth_2_result)
+
+        # running out of nodes in depth 3 leaves the depth 2 result and the position as it was
+        tree = ChessAI.iterative_deepening(
+            TreeNode(ChessAI.get_game_state(position)), max_nodes=ChessAI.nodes_searched + 100
+        )
+        self.assertEqual(ChessAI.completed_depth, 2)
+        self.assertEqual((tree.best_move, tree.eval), depth_2_result)
+        self.assertEqual(position.to_fen(), fen)
+        self.assertEqual(len(position.undo_stack), 0)
+
+        # depth 1 is always finished, however little time there is
+        tree = ChessAI.iterative_deepening(TreeNode(ChessAI.get_game_state(position)), movetime_ms=0)
+        self.assertEqual(ChessAI.completed_depth, 1)
+        self.assertIsNotNone(tree.best_move)
+
+        game = Game()
+        game.calculate_legal_moves()
+        game.update_move_tree(movetime_ms=200)
+        game.play_best_move()
+        self.assertEqual(len(game.move_history), 1)
+
+    def test_move_ordering(self):
+        from .game_classes.ai import ChessAI, TreeNode
+        from .game_classes.position import Position
+        from .game_classes.move_ordering import MoveOrdering
+        from .game_classes.move_encoding import encode_move
+        from .game_classes.bitboards import square_of
+        print(coloured(150, 0, 255, 'Running test_move_ordering'))
+        position = Position.from_fen('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        legal_moves = position.legal_moves()
+        move_ordering = MoveOrdering()
+        # a3 is a killer at ply 2, and Kd1 and then Rb1 have the best history
+        killer = encode_move(square_of((1, 0)), square_of((2, 0)))
+        move_ordering.update('white', killer, 1, 2)
+        king_move = encode_move(square_of((0, 4)), square_of((0, 3)))
+        rook_move = encode_move(square_of((0, 0)), square_of((0, 1)))
+        move_ordering.history['white'][king_move] = 10
+        move_ordering.history['white'][rook_move] = 5
+        self.assertEqual(move_ordering.killers[2], [killer, None])
+
+        staged_moves = list(position.staged_legal_moves(move_ordering=move_ordering, search_ply=2))
+        self.assertEqual(sorted(staged_moves), sorted(legal_moves))
+        captures = position.generate_legal_moves(quiets=False)
+        scores = [position.mvv_lva_score(move) for move in staged_moves[:len(captures)]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        # then the killer, then the quiet moves by history
+        self.assertEqual(staged_moves[len(captures):len(captures) + 3], [killer, king_move, rook_move])
+        # killers aren't used at other plies
+        self.assertNotEqual(list(position.staged_legal_moves(move_ordering=move_ordering))[len(captures)], killer)
+
+        # same result with and without the heuristics, from fewer nodes with them
+        fen = 'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4'
+        results = []
+        for ordering_heuristics in (False, True):
+            settings.set_ordering_heuristics(ordering_heuristics)
+            ChessAI.clear_search_memory()
+            try:
+                tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), 3)
+                results.append((tree.best_move, tree.eval, ChessAI.nodes_searched))
+            finally:
+                settings.set_ordering_heuristics(True)
+        self.assertEqual(results[0][:2], results[1][:2])
+        self.assertLess(results[1][2], results[0][2])
+
+    def test_quiescence(self):
+        import math
+        from .game_classes.ai import ChessAI, TreeNode
+        from .game_classes.position import Position
+        from .game_classes.move_encoding import uci_string_of
+        print(coloured(150, 0, 255, 'Running test_quiescence'))
+        # the pawn on d5 is defended, which a depth 1 search only sees with quiescence search
+        fen = '4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1'
+        best_moves = {}
+        for quiescence in (False, True):
+            settings.set_quiescence(quiescence)
+            try:
+                tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), 1)
+                best_moves[quiescence] = uci_string_of(tree.best_move)
+                self.assertEqual(ChessAI.quiescence_nodes > 0, quiescence)
+            finally:
+                settings.set_quiescence(True)
+        self.assertEqual(best_moves[False], 'd1d5')
+        self.assertNotEqual(best_moves[True], 'd1d5')
+
+        # with no quiescence plies it's the same as the static evaluation
+        settings.set_quiescence_max_ply(0)
+        try:
+            tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), 1)
+            self.assertEqual(uci_string_of(tree.best_move), 'd1d5')
+            self.assertEqual(ChessAI.quiescence_nodes, 0)
+        finally:
+            settings.set_quiescence_max_ply(8)
+
+        # stand pat: a quiet position scores its evaluation
+        position = Position.from_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+        game_state = ChessAI.get_game_state(position)
+        self.assertEqual(
+            ChessAI.quiescence(game_state, -math.inf, math.inf, 0), ChessAI.evaluate_position(game_state)
+        )
+
+        # delta pruning keeps quiescence scores below alpha upper bounds, so alpha-beta gets the same
+        # move and eval as minimax (selective search, which isn't exact, is off by default)
+        for fen in (
+            '2b1kbn1/r1qppppr/p6p/n2P4/p1p1N2P/1PN3P1/R1PKPP2/2BQ1B1R w - - 2 14',
+            '6k1/5ppp/8/3q4/3N4/2B5/5PPP/3R2K1 w - - 0 1',
+            '2r3k1/5ppp/8/8/3n4/8/1B3PPP/3R2K1 b - - 0 1',
+            '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+        ):
+            ChessAI.clear_search_memory()
+            tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), 2)
+            minimax_tree = ChessAI.minimax(TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), 2)
+            self.assertEqual((tree.best_move, tree.eval), (minimax_tree.best_move, minimax_tree.eval))
+
+    def test_selective_search(self):
+        from .game_classes.ai import ChessAI, TreeNode
+        from .game_classes.position import Position
+        print(coloured(150, 0, 255, 'Running test_selective_search'))
+        # a null move only passes the turn and is undone exactly
+        fen = 'rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2'
+        position = Position.from_fen(fen)
+        hash_before = position.hash
+        position.make_null_move()
+        self.assertEqual(position.to_fen(), 'rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 2')
+        self.assertEqual(position.hash, Position.from_fen(position.to_fen()).hash)
+        position.unmake_any_move()
+        self.assertEqual(position.to_fen(), fen)
+        self.assertEqual(position.hash, hash_before)
+        self.assertTrue(position.has_non_pawn_material('white'))
+        self.assertFalse(Position.from_fen('4k3/4p3/8/8/8/8/4P3/4K3 w - - 0 1').has_non_pawn_material('white'))
+
+        # late move reductions and futility pruning each search fewer nodes than neither, and find
+        # the same move here (at depth 3 null moves and razoring don't come into it)
+        setters = (settings.set_late_move_reductions, settings.set_futility_pruning)
+        fen = 'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4'
+        results = []
+        try:
+            for turned_on in (None,) + setters:
+                for setter in setters:
+                    setter(setter is turned_on)
+                ChessAI.clear_search_memory()
+                tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), 3)
+                results.append((tree.best_move, ChessAI.nodes_searched))
+        finally:
+            for setter in setters:
+                setter(False)
+        for best_move, nodes in results[1:]:
+            self.assertEqual(best_move, results[0][0])
+            self.assertLess(nodes, results[0][1])
+
+    def test_principal_variation_search(self):
+        import math
+        from .game_classes.ai import ChessAI, TreeNode
+        from .game_classes.position import Position
+        print(coloured(150, 0, 255, 'Running test_principal_variation_search'))
+        # iterative deepening to depth 3 and a depth 2 search get the same move and eval as with full
+        # windows, with quiescence search. At depth 2 the second position used to play a2a4 after a
+        # null window search accepted a wrong quiescence bound
+        rook_endgame_fen = '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1'
+        nodes = []
+        try:
+            for fen in (
+                'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4',
+                '2b1kbn1/r1qppppr/p6p/n2P4/p1p1N2P/1PN3P1/R1PKPP2/2BQ1B1R w - - 2 14',
+                '6k1/5ppp/8/3q4/3N4/2B5/5PPP/3R2K1 w - - 0 1',
+                rook_endgame_fen,
+            ):
+                results = {}
+                nodes.append({})
+                for enabled in (False, True):
+                    settings.set_principal_variation_search(enabled)
+                    settings.set_aspiration_windows(enabled)
+                    ChessAI.clear_search_memory()
+                    tree = ChessAI.iterative_deepening(
+                        TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), max_depth=3
+                    )
+                    nodes[-1][enabled] = ChessAI.nodes_searched
+                    ChessAI.clear_search_memory()
+                    fixed_depth_tree = ChessAI.calculate_deep_moves(
+                        TreeNode(ChessAI.get_game_state(Position.from_fen(fen))), 2
+                    )
+                    results[enabled] = (
+                        tree.best_move, tree.eval, fixed_depth_tree.best_move, fixed_depth_tree.eval
+                    )
+                self.assertEqual(results[True], results[False])
+        finally:
+            settings.set_principal_variation_search(True)
+            settings.set_aspiration_windows(True)
+        # and from fewer nodes in the quiet first position (re-searches can cost more than they save
+        # in the tactical ones, this shallow)
+        self.assertLess(nodes[0][True], nodes[0][False])
+
+        # a root window the score is outside of gives a bound on it, in the rook endgame
+        ChessAI.clear_search_memory()
+        tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(Position.from_fen(rook_endgame_fen))), 2)
+        score = tree.eval
+        ChessAI.clear_search_memory()
+        tree = ChessAI.calculate_deep_moves(
+            TreeNode(ChessAI.get_game_state(Position.from_fen(rook_endgame_fen))), 2, -math.inf, score - 1
+        )
+        self.assertGreaterEqual(tree.eval, score - 1)
+        ChessAI.clear_search_memory()
+        tree = ChessAI.calculate_deep_moves(
+            TreeNode(ChessAI.get_game_state(Position.from_fen(rook_endgame_fen))), 2, score + 1, math.inf
+        )
+        self.assertLessEqual(tree.eval, score + 1)
+
+    def test_tree_free_search(self):
+        from .game_classes.ai import ChessAI, TreeNode
+        from .game_classes.position import Position
+        from .game_classes.game import Game
+        print(coloured(150, 0, 255, 'Running test_tree_free_search'))
+        for fen in (
+            'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4',
+            'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+        ):
+            results = []
+            try:
+                for tree_free_search in (False, True):
+                    settings.set_tree_free_search(tree_free_search)
+                    ChessAI.clear_search_memory()
+                    position = Position.from_fen(fen)
+                    tree = ChessAI.calculate_deep_moves(TreeNode(ChessAI.get_game_state(position)), 3)
+                    results.append((tree.best_move, tree.eval))
+            finally:
+                settings.set_tree_free_search(True)
+            # same result, without keeping anything below the root's children
+            self.assertEqual(results[0], results[1])
+            self.assertTrue(all(len(child.children) == 0 for child in tree.children.values()))
+            # the principal variation starts with the best move and can be played out
+            self.assertEqual(tree.principal_variation[0], tree.best_move)
+            self.assertEqual(tree.children[tree.best_move].principal_variation, tree.principal_variation[1:])
+            for move in tree.principal_variation:
+                self.assertTrue(position.is_legal_move(move))
+                position.make_move(move)
+
+        game = Game()
+        game.calculate_legal_moves()
+        for _ in range(2):
+            game.update_move_tree(2)
+            game.play_best_move()
+        self.assertEqual(len(game.move_history), 2)
@@ -49,7 +49,7 @@ def create_game(request):
         'legal_moves': game.get_all_legal_moves(),
         'material': game.material,
         'move_history': [str(move) for move in game.move_history],
-        'game_status': vars(game.game_status),
+        'game_status': game.game_status.to_dict(),
     }
     return JsonResponse(response)
 
@@ -93,7 +93,7 @@ def submit_move(request):
         'legal_moves': game.get_all_legal_moves(),
         'material': game.material,
         'move_history': [str(move) for move in game.move_history],
-        'game_status': vars(game.game_status),
+        'game_status': game.game_status.to_dict(),
     }
     return JsonResponse(response)
 
@@ -125,9 +125,17 @@ def play_best_move(request):
             status=400
         )
 
+    depth = request.GET.get('depth')
+    movetime_ms = request.GET.get('movetime_ms')
+    if depth is None and movetime_ms is None:
+        return JsonResponse('depth or movetime_ms required', safe=False, status=400)
+
     try:
-        depth = request.GET.get('depth')
-        game.update_move_tree(int(depth.strip()))
+        # with movetime_ms the search stops after that long (depth, if given, is the most it searches)
+        game.update_move_tree(
+            int(depth.strip()) if depth is not None else None,
+            int(movetime_ms.strip()) if movetime_ms is not None else None
+        )
         from_loc, to_loc, special_move = game.play_best_move()
     except Exception as err:
         return JsonResponse(str(err), safe=False, status=400)
@@ -137,7 +145,7 @@ def play_best_move(request):
         'legal_moves': game.get_all_legal_moves(),
         'material': game.material,
         'move_history': [str(move) for move in game.move_history],
-        'game_status': vars(game.game_status),
+        'game_status': game.game_status.to_dict(),
         'from_loc': from_loc,
         'to_loc': to_loc,
         'special_move': special_move